@@ -1,8 +1,9 @@
 from ninja import NinjaAPI
 from trading.api import router as trading_router
+from trading.ninja_json import TradingJSONRenderer
 
 # Create your router's here.
 
-api = NinjaAPI()
+api = NinjaAPI(renderer=TradingJSONRenderer())
 
 api.add_router("/trading/", trading_router)
\ No newline at end of file
@@ -111,6 +111,8 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            # Tests get an in-memory schema built without migrations (pytest.ini)
+            "TEST": {"NAME": ":memory:"},
         }
     }
 
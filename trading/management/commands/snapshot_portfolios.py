@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Prefetch
+from django.utils import timezone
+from trading.models import Portfolio, PortfolioSnapshot, Holding
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Write end-of-day PortfolioSnapshot rows for all portfolios (run at UTC midnight)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            type=str,
+            default=None,
+            help='Day the snapshot closes, YYYY-MM-DD; only yesterday (UTC) is accepted'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per INSERT (default: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        # Run just after midnight UTC: the day that just closed
+        snapshot_date = timezone.now().date() - timedelta(days=1)
+        if options['date']:
+            try:
+                requested_date = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError(f"Invalid --date '{options['date']}', expected YYYY-MM-DD")
+            # Values come from the current cash_balance and current_price, so they are only
+            # the end-of-day value for the day that just closed; no backfill of older days
+            if requested_date != snapshot_date:
+                raise CommandError(
+                    f"Cannot snapshot {requested_date}: only the day that just closed "
+                    f"({snapshot_date}) can be valued from current prices"
+                )
+
+        # Portfolios already snapshotted for this day are skipped (re-runs are safe)
+        existing = set(
+            PortfolioSnapshot.objects.filter(date=snapshot_date).values_list('portfolio_id', flat=True)
+        )
+
+        # Two queries: portfolios still missing a snapshot, then their holdings with cryptocurrency
+        portfolios = Portfolio.objects.exclude(id__in=existing).prefetch_related(
+            Prefetch('holdings', queryset=Holding.objects.select_related('cryptocurrency'))
+        )
+
+        snapshots = []
+        for portfolio in portfolios:
+            holdings_value = sum(
+                (
+                    holding.quantity * holding.cryptocurrency.current_price
+                    for holding in portfolio.holdings.all()
+                    if holding.cryptocurrency.current_price
+                ),
+                Decimal('0'),
+            ).quantize(Decimal('0.01'))
+
+            snapshots.append(PortfolioSnapshot(
+                portfolio=portfolio,
+                date=snapshot_date,
+                value=portfolio.cash_balance + holdings_value,
+                cash=portfolio.cash_balance,
+                holdings_value=holdings_value,
+            ))
+
+        # ignore_conflicts only guards against a concurrent run writing the same
+        # (portfolio, date) rows between the existence check and this insert
+        PortfolioSnapshot.objects.bulk_create(
+            snapshots,
+            batch_size=options['batch_size'],
+            ignore_conflicts=True,
+        )
+
+        # Rows dropped by ignore_conflicts are not reported back, so count what was stored
+        written = PortfolioSnapshot.objects.filter(date=snapshot_date).count() - len(existing)
+
+        logger.info(
+            "Snapshotted %s portfolios for %s (%s already had a snapshot)",
+            written, snapshot_date, len(existing)
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Snapshotted {written} portfolios for {snapshot_date} '
+            f'({len(existing)} already had a snapshot)'
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2025-10-24 10:00
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trading', '0008_user_city_user_state_user_zip_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('value', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('cash', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('holdings_value', models.DecimalField(decimal_places=2, max_digits=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('portfolio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='trading.portfolio')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'unique_together': {('portfolio', 'date')},
+            },
+        ),
+    ]
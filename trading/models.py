@@ -18,6 +18,7 @@ Models:
     Holding: User's current crypto positions with cost basis
     Transaction: Historical buy/sell records with realized gains
     PriceHistory: Time-series price data for charting
+    PortfolioSnapshot: End-of-day portfolio valuations for history charts
 
 External Dependencies:
     - CoinGecko: Live price updates (current_price, market_cap, etc.)
@@ -554,4 +555,54 @@ class PriceHistory(models.Model):
         ]
 
     def __str__(self):
-        return f"{self.cryptocurrency.symbol} - ${self.price} at {self.timestamp}"
\ No newline at end of file
+        return f"{self.cryptocurrency.symbol} - ${self.price} at {self.timestamp}"
+
+
+class PortfolioSnapshot(models.Model):
+    """
+    End-of-day portfolio valuation, precomputed for history charts.
+
+    One row per portfolio per UTC calendar day, written by the snapshot_portfolios
+    management command shortly after midnight UTC. PortfolioService.calculate_portfolio_history
+    reads these rows for past days on daily timeframes and only values the remaining
+    points (today, missing days) live.
+
+    Attributes:
+        id (UUID): Primary key, auto-generated UUID
+        portfolio (Portfolio): Reference to the valued portfolio (CASCADE delete)
+        date (date): UTC calendar day the valuation closes (EOD)
+        value (Decimal): Total portfolio value, cash + holdings_value (2 decimal places)
+        cash (Decimal): Cash balance at snapshot time (2 decimal places)
+        holdings_value (Decimal): Market value of holdings at snapshot time (2 decimal places)
+        created_at (datetime): Row creation timestamp (timezone-aware, auto-set)
+
+    Relationships:
+        portfolio (Portfolio): Many-to-one relationship (user's portfolio)
+
+    Indexes:
+        - Unique constraint: (portfolio, date): One snapshot per portfolio per day; also
+          serves portfolio date-range reads
+        - Default ordering: By date descending (most recent first)
+
+    Notes:
+        - Rows are immutable; re-running the command for a day leaves existing rows untouched
+        - Values use current cash and current_price at snapshot time (no reconstruction)
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    portfolio = models.ForeignKey(
+        Portfolio,
+        on_delete=models.CASCADE,
+        related_name='snapshots'
+    )
+    date = models.DateField()
+    value = models.DecimalField(max_digits=20, decimal_places=2)
+    cash = models.DecimalField(max_digits=15, decimal_places=2)
+    holdings_value = models.DecimalField(max_digits=20, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('portfolio', 'date')
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.portfolio} - ${self.value} on {self.date}"
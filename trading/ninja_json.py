@@ -0,0 +1,31 @@
+"""
+Fast JSON rendering for the django-ninja API.
+
+django-ninja validates and dumps a typed endpoint's result, then hands the
+resulting dicts/lists to the API's renderer. The stock JSONRenderer encodes
+them with json.dumps() and NinjaJSONEncoder, one Python-level default() call
+per Decimal and datetime. For nested payloads such as /holdings and
+/transactions that is most of the rendering time.
+
+TradingJSONRenderer encodes the same data with pydantic-core's to_json(),
+which writes the JSON bytes in Rust. It is installed through ninja's public
+renderer hook (NinjaAPI(renderer=...) in backend/router.py), so it only
+applies to that API and no ninja internals are replaced.
+
+Wire format:
+    - Decimals are strings with their stored exponent, as before ("48000.00")
+    - UTC datetimes are ISO-8601 with a Z suffix, as before
+    - API change: datetimes keep full microsecond precision
+      ("2025-01-15T12:30:45.123456Z"); NinjaJSONEncoder truncated them to
+      milliseconds ("2025-01-15T12:30:45.123Z")
+    - Types pydantic-core does not know fall back to NinjaJSONEncoder.default()
+"""
+from pydantic_core import to_json
+from ninja.renderers import JSONRenderer
+
+
+class TradingJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with pydantic-core instead of json.dumps()."""
+
+    def render(self, request, data, *, response_status):
+        return to_json(data, fallback=self.encoder_class().default)
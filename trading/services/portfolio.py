@@ -12,6 +12,7 @@ Core Features:
     - Post-inception valuation: cash + Σ(quantity × price) mark-to-market
     - Forward-fill price strategy for missing data points
     - Non-blocking price failures (assets contribute $0 if price unavailable)
+    - End-of-day PortfolioSnapshot rows reused for past days on daily timeframes
 
 Timeframe Limits:
     - Portfolio-specific timeframes: 1D, 5D, 1M, 3M, 6M, YTD (capped at YTD)
@@ -38,7 +39,7 @@ Cash Approximation:
 
 Dependencies:
     - CoinGeckoService: Historical price data (get_historical_prices)
-    - trading.models: Portfolio, Transaction, Cryptocurrency
+    - trading.models: Portfolio, Transaction, Cryptocurrency, PortfolioSnapshot
     - django.utils.timezone: Timezone-aware datetime handling
 
 Side Effects:
@@ -51,18 +52,112 @@ Notes:
     - Frontend charts display results in Recharts
     - Timeframe selection handled by client (Portfolio.js tabs)
 """
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
 from decimal import Decimal
 from datetime import datetime, timedelta
 from django.utils import timezone
-from django.db.models import Q
-from typing import List, Dict
-from trading.models import Portfolio, Transaction, PriceHistory, Cryptocurrency
+from django.db.models import Case, When, F, DecimalField, Sum, Window
+from typing import List, Dict, Optional, Tuple, Union
+from trading.models import Portfolio, Transaction, Cryptocurrency, PortfolioSnapshot
 from trading.services.coingecko import CoinGeckoService
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _epoch_seconds(timestamps) -> np.ndarray:
+    """Timezone-aware datetimes -> float64 POSIX seconds (sortable, searchsorted-ready)."""
+    return np.fromiter((t.timestamp() for t in timestamps), dtype=np.float64, count=len(timestamps))
+
+
+def _to_usd(value: float) -> Decimal:
+    """Round a float USD amount to a 2-decimal Decimal for output."""
+    return Decimal(f"{value:.2f}")
+
+
+def _value_series(targets: np.ndarray, positions) -> np.ndarray:
+    """
+    Holdings value at each target time: the numeric kernel of the history valuation.
+
+    Args:
+        targets (np.ndarray): Sorted float64 epoch seconds of the time points
+        positions: One (trade_seconds, cumulative_quantity, price_seconds, prices) tuple of
+            sorted float64 arrays per crypto
+
+    Returns:
+        np.ndarray: float64 Σ(quantity × price) per target
+
+    Notes:
+        - Per crypto, one searchsorted reads the quantity held and one the forward-filled
+          price at every target, then a single multiply-add: O(T + N_tx + N_prices)
+        - Before a crypto's first trade, and for net-short quantities, the quantity is 0
+        - Targets before the first price use the earliest price (forward-fill fallback)
+    """
+    out = np.zeros(len(targets), dtype=np.float64)
+    for trade_seconds, cumulative_quantity, price_seconds, prices in positions:
+        trade_idx = np.searchsorted(trade_seconds, targets, side='right') - 1
+        quantity = cumulative_quantity[np.clip(trade_idx, 0, None)]
+        quantity[(trade_idx < 0) | (quantity < 0)] = 0.0
+        price_idx = np.searchsorted(price_seconds, targets, side='right') - 1
+        out += quantity * prices[np.clip(price_idx, 0, None)]
+    return out
+
+
+_HOURLY = timedelta(hours=1)
+_DAILY = timedelta(days=1)
+
+# Timeframe -> (point count, interval) - PORTFOLIO-SPECIFIC LIMITS (YTD is max)
+# NOTE: Market/asset time-series may still use 1Y, 5Y, MAX
+# YTD's count depends on the date, so it is computed per call (days since Jan 1)
+_TIMEFRAME_CONFIG = {
+    '1D': (24, _HOURLY),
+    '5D': (120, _HOURLY),
+    '1M': (30, _DAILY),
+    '3M': (90, _DAILY),
+    '6M': (180, _DAILY),
+    'YTD': (None, _DAILY),
+}
+
+
+def _build_timepoints(start_date: datetime, count: int, interval: timedelta) -> Tuple[datetime, ...]:
+    """
+    Time grid for a history request: count points, interval apart, from start_date.
+
+    Not cached: start_date carries the request's clock reading down to the
+    microsecond, so no two production requests would share a key.
+    """
+    return tuple(start_date + interval * i for i in range(count))
+
+
+class HistoryPoint(namedtuple('HistoryPoint', ['timestamp', 'portfolio_value'])):
+    """
+    One portfolio history point: a slotted tuple instead of a per-point dict.
+
+    Also readable by key (point['timestamp'], point['portfolio_value']) like the dicts
+    it replaces, and `in` tests field names ('timestamp' in point) as it did for
+    the dicts; integer indexes and unpacking work as for any tuple.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return getattr(self, key)
+        return super().__getitem__(key)
+
+    def __contains__(self, key):
+        return key in self._fields
+
+
+# Shared instance for "no price" results (Decimals are immutable)
+_DECIMAL_ZERO = Decimal('0')
+
+# (sorted timestamps, prices in the same order) for one cryptocurrency
+PriceIndex = Tuple[List[datetime], List[Decimal]]
+_EMPTY_PRICE_INDEX: PriceIndex = ([], [])
+
+
 class PortfolioService:
     """
     Portfolio analytics service for time-series calculations and historical valuation.
@@ -73,6 +168,7 @@ class PortfolioService:
 
     Methods:
         calculate_portfolio_history: Generate time-series portfolio values for charting
+        _build_price_index: Sort a price mapping once for bisect lookups
         _get_closest_price: Find closest historical price using forward-fill strategy
 
     Error Handling:
@@ -89,8 +185,9 @@ class PortfolioService:
     @staticmethod
     def calculate_portfolio_history(
         portfolio: Portfolio,
-        timeframe: str
-    ) -> List[Dict]:
+        timeframe: str,
+        now: Optional[datetime] = None
+    ) -> List[HistoryPoint]:
         """
         Calculate historical portfolio values over time with inception handling and mark-to-market valuation.
 
@@ -100,6 +197,7 @@ class PortfolioService:
 
         Inception Logic:
             - Inception = min(first_transaction.timestamp, portfolio.created_at)
+            - First trade is row 0 of the timestamp-ordered trade fetch (no extra query)
             - Handles back-dated trades (trades may precede portfolio creation)
             - Pre-inception time points: Return portfolio.initial_cash (flat value)
             - Post-inception time points: Return cash + Σ(quantity × historical_price)
@@ -136,14 +234,18 @@ class PortfolioService:
                 - '6M': Last 180 days (daily intervals)
                 - 'YTD': Year to date (daily intervals)
                 Defaults to '1M' if invalid value provided
+            now (datetime, optional): Timezone-aware "current" time the window ends at.
+                Defaults to timezone.now(); tests pass a fixed datetime instead of
+                freezing the clock
 
         Returns:
-            List[Dict]: Chronological time-series data points:
+            List[HistoryPoint]: Chronological time-series data points, each readable as
+            point.timestamp or point['timestamp']:
                 [
-                    {
-                        'timestamp': datetime (timezone-aware UTC),
-                        'portfolio_value': Decimal (USD)
-                    },
+                    HistoryPoint(
+                        timestamp=datetime (timezone-aware UTC),
+                        portfolio_value=Decimal (USD)
+                    ),
                     ...
                 ]
 
@@ -160,9 +262,20 @@ class PortfolioService:
             - Invalid timeframe: Defaults to '1M' (30 days)
 
         Performance Considerations:
-            - Batch fetches all crypto prices upfront (N API calls for N cryptos)
+            - Batch fetches all crypto prices upfront (N API calls for N cryptos, one
+              Cryptocurrency query)
             - Caches prices in memory for time-series calculation
-            - Incremental holdings reconstruction (avoids repeated database queries)
+            - Holdings reconstructed as a per-crypto step function (cumulative quantity after
+              each trade) read at every time point with np.searchsorted, O(T + N_tx), with no
+              per-point database queries or Python loops
+            - Timeframes resolved from the module-level _TIMEFRAME_CONFIG table; time grid
+              built by _build_timepoints()
+            - Daily timeframes read past days from PortfolioSnapshot (one query) and value
+              only today and days without a snapshot live
+            - Prices forward-filled onto the time grid with one NumPy searchsorted per crypto
+              inside the _value_series() kernel;
+              valuation (cash, quantities, prices) runs in float64 and is rounded to
+              2-decimal Decimals on output
             - CoinGecko rate limits: Free tier ~10-50 calls/min, Pro tier ~500 calls/min
 
         Example:
@@ -173,8 +286,8 @@ class PortfolioService:
             )
             # Returns:
             # [
-            #     {'timestamp': datetime(2025, 01, 15, 0, 0), 'portfolio_value': Decimal('10000.00')},
-            #     {'timestamp': datetime(2025, 01, 16, 0, 0), 'portfolio_value': Decimal('10250.75')},
+            #     HistoryPoint(timestamp=datetime(2025, 01, 15, 0, 0), portfolio_value=Decimal('10000.00')),
+            #     HistoryPoint(timestamp=datetime(2025, 01, 16, 0, 0), portfolio_value=Decimal('10250.75')),
             #     ...
             # ]
 
@@ -184,42 +297,111 @@ class PortfolioService:
             - Timezone-aware timestamps (USE_TZ=True)
             - YTD timeframe dynamically calculated based on current date
         """
-        # Define timeframe parameters - PORTFOLIO-SPECIFIC LIMITS (YTD is max)
-        # NOTE: Market/asset time-series may still use 1Y, 5Y, MAX
-        now = timezone.now()
-        timeframe_config = {
-            '1D': {'days': 1, 'interval': 'hourly'},
-            '5D': {'days': 5, 'interval': 'hourly'},
-            '1M': {'days': 30, 'interval': 'daily'},
-            '3M': {'days': 90, 'interval': 'daily'},  # Added 3M support
-            '6M': {'days': 180, 'interval': 'daily'},
-            'YTD': {'days': (now - datetime(now.year, 1, 1, tzinfo=now.tzinfo)).days, 'interval': 'daily'},
-            # Removed 1Y, 5Y, MAX - portfolio time-series capped at YTD
-        }
+        # Read the clock once (unless injected): window start, YTD length, snapshot cutoff and
+        # price fallbacks all derive from this aware datetime (no further now()/make_aware calls)
+        if now is None:
+            now = timezone.now()
+
+        # Timeframe parameters from the module-level table; unknown values fall back to 1M
+        count, interval = _TIMEFRAME_CONFIG.get(timeframe, _TIMEFRAME_CONFIG['1M'])
+        if count is None:  # YTD: one daily point per day since Jan 1
+            count = (now - datetime(now.year, 1, 1, tzinfo=now.tzinfo)).days
+        window_days = (interval * count).days
+        start_date = now - interval * count
+
+        # Read the portfolio fields once; the loops below only touch locals
+        initial_cash = portfolio.initial_cash
+        created_at = portfolio.created_at
 
-        config = timeframe_config.get(timeframe, timeframe_config['1M'])
-        start_date = now - timedelta(days=config['days'])
+        # TODO: Future enhancement - implement exact cash reconstruction
+        # Currently approximating historical cash as current cash_balance
+        # For accurate P&L, should track cash flow ledger (deposits/withdrawals)
+        # and reconstruct cash(t) = initial_cash - Σbuys(≤t) + Σsells(≤t)
+        cash_value = portfolio.cash_balance  # Approximation per spec
+        cash_balance = float(cash_value)  # For float valuation; cash_value is reused as-is
+
+        # Full trade history in one query, materialized before any time-point loop
+        # (served by Transaction's (portfolio, -timestamp) index, scanned in reverse).
+        # Holdings at t depend on every trade <= t, including trades before the window.
+        # Only the columns the valuation reads, as lightweight named tuples; the BUY/SELL
+        # sign is applied in SQL (Case/When), so no per-row transaction_type branch below
+        trades_query = Transaction.objects.filter(portfolio=portfolio).annotate(
+            signed_quantity=Case(
+                When(transaction_type=Transaction.TransactionType.BUY, then=F('quantity')),
+                default=-F('quantity'),
+                output_field=DecimalField(max_digits=20, decimal_places=8),
+            )
+        )
+        # The running quantity per crypto (the holdings step function) comes back from a
+        # window function, SUM(...) OVER (PARTITION BY crypto ORDER BY timestamp), on every
+        # backend (PostgreSQL, and SQLite >= 3.25 in tests). Its default RANGE frame gives
+        # tied timestamps the same, complete total.
+        trades_query = trades_query.annotate(quantity_held=Window(
+            Sum('signed_quantity'),
+            partition_by=[F('cryptocurrency_id')],
+            order_by=F('timestamp').asc(),
+        ))
+        transactions = list(
+            trades_query.order_by('timestamp')
+            .values_list('timestamp', 'cryptocurrency_id', 'quantity_held', named=True)
+        )
 
         # Calculate inception: earliest of (first trade, portfolio creation)
-        # Trades may be back-dated, so inception can precede portfolio.created_at
-        first_transaction = Transaction.objects.filter(
-            portfolio=portfolio
-        ).order_by('timestamp').first()
-
-        if first_transaction:
-            inception = min(first_transaction.timestamp, portfolio.created_at)
+        # Trades may be back-dated, so inception can precede portfolio.created_at.
+        # The fetch above is already ordered by the (portfolio, timestamp) index, so the
+        # first trade is simply row 0 - no separate ORDER BY ... LIMIT 1 query, no scan
+        if transactions:
+            inception = min(transactions[0].timestamp, created_at)
         else:
-            inception = portfolio.created_at
+            inception = created_at
+
+        time_points = _build_timepoints(start_date, count, interval)
+
+        # PRE-INCEPTION: Flat initial_investment. Time points are sorted, so the whole
+        # pre-inception stretch is one slice (sharing the initial_cash Decimal) and the
+        # pricing below only runs on the remaining points
+        split = bisect_left(time_points, inception)
+        data_points = [
+            HistoryPoint(time_point, initial_cash)
+            for time_point in time_points[:split]
+        ]
+        live_points = time_points[split:]
+        if not live_points:
+            return data_points  # Whole window predates inception: no prices needed
+
+        # Past days on daily timeframes come from end-of-day snapshots (snapshot_portfolios
+        # command) when present; only the remaining points (today, missing days) are valued live
+        snapshot_values = {}
+        if interval == _DAILY:
+            snapshot_values = dict(
+                PortfolioSnapshot.objects.filter(
+                    portfolio=portfolio,
+                    date__gte=start_date.date(),
+                    date__lt=now.date(),
+                ).values_list('date', 'value')
+            )
 
-        # Get all transactions in timeframe
-        transactions = Transaction.objects.filter(
-            portfolio=portfolio,
-            timestamp__gte=start_date
-        ).order_by('timestamp').select_related('cryptocurrency')
+        # EMPTY: With no trades nothing is ever held, so every live point is cash only -
+        # skip the price lookups (stored-price query, CoinGecko calls) entirely
+        if not transactions:
+            data_points.extend(
+                HistoryPoint(time_point, snapshot_values.get(time_point.date(), cash_value))
+                if snapshot_values else HistoryPoint(time_point, cash_value)
+                for time_point in live_points
+            )
+            return data_points
+
+        # Quantity events in timestamp order: (timestamp, crypto_id, quantity held after the trade).
+        # Quantities are converted to float once here; float64 keeps 15-17 significant digits,
+        # ample for crypto quantities at the model's 8 decimal places
+        events = [
+            (txn.timestamp, txn.cryptocurrency_id, float(txn.quantity_held))
+            for txn in transactions
+        ]
 
         # Get historical prices for all cryptocurrencies held
         crypto_ids = set(txn.cryptocurrency_id for txn in transactions)
-        crypto_ids.update(holding.cryptocurrency_id for holding in portfolio.holdings.all())
+        crypto_ids.update(portfolio.holdings.values_list('cryptocurrency_id', flat=True))
 
         cryptos = Cryptocurrency.objects.filter(id__in=crypto_ids)
 
@@ -231,7 +413,7 @@ class PortfolioService:
             try:
                 historical_prices = coingecko_service.get_historical_prices(
                     crypto.coingecko_id,
-                    config['days']
+                    window_days
                 )
                 price_cache[crypto.id] = {
                     hp['timestamp']: hp['price']
@@ -253,76 +435,77 @@ class PortfolioService:
                 else:
                     price_cache[crypto.id] = {}
 
-        # Calculate portfolio value at each time point
-        data_points = []
+        # Sort each crypto's prices once so every time point is an O(log n) bisect
+        price_index = {
+            crypto_id: PortfolioService._build_price_index(prices)
+            for crypto_id, prices in price_cache.items()
+        }
 
-        if config['interval'] == 'hourly':
-            time_points = [start_date + timedelta(hours=i) for i in range(config['days'] * 24)]
-        elif config['interval'] == 'daily':
-            time_points = [start_date + timedelta(days=i) for i in range(config['days'])]
-        else:
-            time_points = [start_date + timedelta(weeks=i) for i in range(config['days'] // 7)]
+        # Holdings step function per crypto: cumulative quantity after each of its trades
+        # (running totals from the DB); events are time-sorted, so each crypto's trades are too
+        trades = {}
+        for timestamp, crypto_id, quantity in events:
+            times, quantities = trades.setdefault(crypto_id, ([], []))
+            times.append(timestamp)
+            quantities.append(quantity)
+
+        # Pack each traded, priced crypto into float64 arrays for the valuation kernel
+        positions = []
+        for crypto_id, (times, quantities) in trades.items():
+            price_times, prices = price_index.get(crypto_id, _EMPTY_PRICE_INDEX)
+            if not price_times:
+                # Missing prices are non-blocking; holding contributes $0 to portfolio value
+                # This can happen for very recent dates where CoinGecko data isn't yet available
+                continue
+            positions.append((
+                _epoch_seconds(times),
+                np.asarray(quantities, dtype=np.float64),
+                _epoch_seconds(price_times),
+                np.asarray(prices, dtype=np.float64),
+            ))
+
+        holdings_value = _value_series(_epoch_seconds(live_points), positions)
+
+        # Calculate portfolio value at each post-inception time point
+        for i, time_point in enumerate(live_points):
+            # SNAPSHOT: Precomputed EOD value for this day (no date conversion when there are none)
+            snapshot_value = snapshot_values.get(time_point.date()) if snapshot_values else None
+            if snapshot_value is not None:
+                data_points.append(HistoryPoint(time_point, snapshot_value))
+                continue
 
-        # Track holdings over time
-        holdings_tracker = {}
+            # Float valuation internally (cash, quantities, prices); Decimal (2dp) only at output.
+            # All-cash points share the cash_balance Decimal instead of building a new one
+            if holdings_value[i]:
+                portfolio_value = _to_usd(cash_balance + holdings_value[i])
+            else:
+                portfolio_value = cash_value
 
-        # TODO: Future enhancement - implement exact cash reconstruction
-        # Currently approximating historical cash as current cash_balance
-        # For accurate P&L, should track cash flow ledger (deposits/withdrawals)
-        # and reconstruct cash(t) = initial_cash - Σbuys(≤t) + Σsells(≤t)
-        cash_balance = portfolio.cash_balance  # Approximation per spec
-
-        for time_point in time_points:
-            # PRE-INCEPTION: Return flat initial_investment
-            if time_point < inception:
-                data_points.append({
-                    'timestamp': time_point,
-                    'portfolio_value': portfolio.initial_cash
-                })
-                continue
+            data_points.append(HistoryPoint(time_point, portfolio_value))
 
-            # POST-INCEPTION: Calculate mark-to-market value
-            # Apply all transactions up to this point
-            relevant_txns = [t for t in transactions if t.timestamp <= time_point]
+        return data_points
 
-            # Reset and recalculate quantities
-            holdings_tracker = {}
+    @staticmethod
+    def _build_price_index(prices: Dict[datetime, Decimal]) -> PriceIndex:
+        """
+        Sort a price history mapping into parallel timestamp/price lists for bisect lookups.
 
-            for txn in relevant_txns:
-                if txn.transaction_type == Transaction.TransactionType.BUY:
-                    holdings_tracker[txn.cryptocurrency_id] = holdings_tracker.get(
-                        txn.cryptocurrency_id, Decimal('0')
-                    ) + txn.quantity
-                else:
-                    holdings_tracker[txn.cryptocurrency_id] = holdings_tracker.get(
-                        txn.cryptocurrency_id, Decimal('0')
-                    ) - txn.quantity
-
-            # Calculate holdings value at this time point (forward-fill prices)
-            holdings_value = Decimal('0')
-            for crypto_id, quantity in holdings_tracker.items():
-                if quantity > 0:
-                    crypto_prices = price_cache.get(crypto_id, {})
-                    closest_price = PortfolioService._get_closest_price(
-                        crypto_prices,
-                        time_point
-                    )
-                    if closest_price:
-                        holdings_value += quantity * closest_price
-                    # Note: Missing prices are non-blocking; holding contributes $0 to portfolio value
-                    # This can happen for very recent dates where CoinGecko data isn't yet available
-
-            portfolio_value = cash_balance + holdings_value
-
-            data_points.append({
-                'timestamp': time_point,
-                'portfolio_value': portfolio_value
-            })
+        Args:
+            prices (Dict[datetime, Decimal]): Price history mapping (timestamp -> USD price)
 
-        return data_points
+        Returns:
+            PriceIndex: (sorted_timestamps, prices_in_same_order); both empty if no prices
+
+        Notes:
+            - Built once per cryptocurrency per history calculation, outside the time-point loop
+        """
+        if not prices:
+            return _EMPTY_PRICE_INDEX
+        timestamps = sorted(prices)
+        return timestamps, [prices[t] for t in timestamps]
 
     @staticmethod
-    def _get_closest_price(prices: Dict[datetime, Decimal], target: datetime) -> Decimal:
+    def _get_closest_price(prices: Union[PriceIndex, Dict[datetime, Decimal]], target: datetime) -> Decimal:
         """
         Find the closest historical price to target timestamp using forward-fill strategy.
 
@@ -333,7 +516,7 @@ class PortfolioService:
         Forward-Fill Strategy:
             1. Primary: Use most recent price where timestamp <= target
             2. Fallback: Use earliest available price if no prior prices exist
-            3. Default: Return Decimal('0') if prices dict is empty
+            3. Default: Return Decimal('0') if no prices are available
 
         Use Cases:
             - Handling missing intraday prices (CoinGecko daily intervals)
@@ -341,24 +524,23 @@ class PortfolioService:
             - Weekend/holiday price continuation for 24/7 crypto markets
 
         Args:
-            prices (Dict[datetime, Decimal]): Price history mapping:
+            prices (PriceIndex | Dict[datetime, Decimal]): Either a pre-sorted index from
+                _build_price_index() (hot path), or a raw price history mapping:
                 {
                     datetime (timezone-aware): Decimal (USD price),
                     ...
                 }
+                A mapping is converted to an index on each call.
             target (datetime): Target timestamp for price lookup (timezone-aware)
 
         Returns:
             Decimal: Price at or before target timestamp. Returns Decimal('0') if no prices available.
 
         Algorithm:
-            1. Filter prices to only timestamps <= target (prior_prices)
-            2. If prior_prices exists:
-               - Return price at max(prior_prices.keys()) [most recent prior]
-            3. Else (no prior prices):
-               - Return price at min(prices.keys()) [earliest available]
-            4. If prices dict is empty:
-               - Return Decimal('0')
+            1. i = bisect_right(sorted_timestamps, target) - 1  [O(log n)]
+            2. If i >= 0: return price at i [most recent at or before target]
+            3. Else (target precedes all prices): return earliest price
+            4. If no prices: return Decimal('0')
 
         Example:
             prices = {
@@ -383,19 +565,15 @@ class PortfolioService:
             - Private method (internal use by calculate_portfolio_history)
             - No database access (operates on in-memory price cache)
             - Timezone-aware datetime required for correct comparison
-            - Empty prices dict returns 0 (asset contributes $0 to portfolio value)
+            - Empty prices return 0 (asset contributes $0 to portfolio value)
         """
-        if not prices:
-            return Decimal('0')
-
-        # Forward-fill: get all prices at or before target
-        prior_prices = {t: p for t, p in prices.items() if t <= target}
+        if isinstance(prices, dict):
+            prices = PortfolioService._build_price_index(prices)
 
-        if prior_prices:
-            # Return most recent prior price
-            closest_time = max(prior_prices.keys())
-            return prior_prices[closest_time]
+        timestamps, values = prices
+        if not timestamps:
+            return _DECIMAL_ZERO
 
-        # Fallback: use earliest available price (rare edge case)
-        closest_time = min(prices.keys())
-        return prices[closest_time]
+        i = bisect_right(timestamps, target) - 1
+        # i < 0: target precedes all prices, fall back to earliest available
+        return values[i] if i >= 0 else values[0]
@@ -216,11 +216,11 @@ class TradingService:
                     realized_gain_loss=Decimal('0.00')  # BUY transactions have no realized gain/loss
                 )
 
-                logger.info(f"Buy executed: {quantity} {cryptocurrency.symbol} for ${amount_usd}")
+                logger.info("Buy executed: %s %s for $%s", quantity, cryptocurrency.symbol, amount_usd)
                 return True, txn, None
                 
         except Exception as e:
-            logger.error(f"Error executing buy: {e}")
+            logger.error("Error executing buy: %s", e)
             return False, None, f"Trade execution failed: {str(e)}"
     
     @staticmethod
@@ -372,9 +372,12 @@ class TradingService:
                     realized_gain_loss=realized_gain_loss
                 )
 
-                logger.info(f"Sell executed: {quantity} {cryptocurrency.symbol} for ${amount_usd} | Realized P&L: ${realized_gain_loss}")
+                logger.info(
+                    "Sell executed: %s %s for $%s | Realized P&L: $%s",
+                    quantity, cryptocurrency.symbol, amount_usd, realized_gain_loss
+                )
                 return True, txn, None
                 
         except Exception as e:
-            logger.error(f"Error executing sell: {e}")
+            logger.error("Error executing sell: %s", e)
             return False, None, f"Trade execution failed: {str(e)}"
\ No newline at end of file
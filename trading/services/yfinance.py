@@ -85,15 +85,15 @@ def fetch_price_history_payload(symbol: str, period: str = "1y", interval: str =
         }
     df["Close"] = df["Close"].ffill()
 
+    # Rename once up front so rows can be read under their final names (no intermediate copy)
+    df = df.rename(columns={"Close": "close", "Volume": "volume"})
+
     # Build clean payload rows
-    keep_cols = ["date", "Close", "Volume"]
+    keep_cols = ["date", "close", "volume"]
     if is_intraday:
         keep_cols.insert(1, "datetime")
 
-    out = df[keep_cols].copy()
-    out.rename(columns={"Close": "close", "Volume": "volume"}, inplace=True)
-
-    data = out.to_dict(orient="records")
+    data = df[keep_cols].to_dict(orient="records")
     return {
         "symbol": symbol.upper(),
         "period": period_norm,
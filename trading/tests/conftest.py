@@ -19,6 +19,78 @@ from trading.tests.factories import (
     TransactionFactory,
     PriceHistoryFactory,
 )
+from django.db import DEFAULT_DB_ALIAS
+from trading.models import Cryptocurrency, Holding
+
+
+# Column order of the session-cached cryptocurrency rows (see baseline_cryptos)
+_CRYPTO_ATTNAMES = [field.attname for field in Cryptocurrency._meta.concrete_fields]
+
+# Reference cryptocurrencies seeded once per session by ``baseline_cryptos``
+CRYPTO_SEEDS = [
+    {
+        'symbol': 'BTC',
+        'name': 'Bitcoin',
+        'coingecko_id': 'bitcoin-test',
+        'current_price': Decimal('50000.00'),
+        'price_change_24h': Decimal('2.5'),
+        'volume_24h': Decimal('1000000000.00'),
+        'market_cap': Decimal('1000000000000.00'),
+        'icon_url': 'https://example.com/btc.png',
+        'category': Cryptocurrency.Category.CRYPTO,
+        'is_active': True,
+    },
+    {
+        'symbol': 'ETH',
+        'name': 'Ethereum',
+        'coingecko_id': 'ethereum-test',
+        'current_price': Decimal('3000.00'),
+        'price_change_24h': Decimal('-1.2'),
+        'volume_24h': Decimal('500000000.00'),
+        'market_cap': Decimal('500000000000.00'),
+        'icon_url': 'https://example.com/eth.png',
+        'category': Cryptocurrency.Category.CRYPTO,
+        'is_active': True,
+    },
+    {
+        'symbol': 'USDC',
+        'name': 'USD Coin',
+        'coingecko_id': 'usd-coin-test',
+        'current_price': Decimal('1.00'),
+        'price_change_24h': Decimal('0.01'),
+        'volume_24h': Decimal('100000000.00'),
+        'market_cap': Decimal('50000000000.00'),
+        'icon_url': 'https://example.com/usdc.png',
+        'category': Cryptocurrency.Category.STABLECOIN,
+        'is_active': True,
+    },
+]
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """
+    Enforce ``@pytest.mark.max_queries(n)``.
+
+    Only the test body is measured (fixture setup has already run), so the
+    budget pins the query count of the endpoint or service under test, e.g.
+    to catch N+1 regressions from a dropped select_related.
+    """
+    marker = item.get_closest_marker('max_queries')
+    if marker is None:
+        return (yield)
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    limit = marker.args[0]
+    with CaptureQueriesContext(connection) as ctx:
+        result = yield
+    executed = len(ctx.captured_queries)
+    if executed > limit:
+        queries = '\n'.join(q['sql'] for q in ctx.captured_queries)
+        pytest.fail(f'{executed} queries executed, max_queries={limit}:\n{queries}')
+    return result
 
 
 @pytest.fixture
@@ -27,6 +99,21 @@ def user():
     return UserFactory()
 
 
+@pytest.fixture
+def no_user(db):
+    """
+    Opt out of user creation for "no user exists" endpoint tests.
+
+    With --nomigrations nothing seeds users, so the per-test transaction
+    already starts with an empty users table and the rollback at teardown is
+    the only cleanup. A reused database built with --migrations still holds
+    the 0002 demo user; only then is it deleted (and rolled back).
+    """
+    from trading.models import User
+    if User.objects.exists():
+        User.objects.all().delete()
+
+
 @pytest.fixture
 def portfolio(user):
     """
@@ -40,80 +127,68 @@ def portfolio(user):
     return PortfolioFactory(user=user)
 
 
+@pytest.fixture(scope='session')
+def baseline_cryptos(django_db_setup, django_db_blocker):
+    """
+    Seed ``CRYPTO_SEEDS`` once per test session and cache the committed rows.
+
+    Rows are written outside the per-test transaction so every test shares
+    them; changes a test makes to these rows are rolled back at teardown.
+    Combined with --reuse-db the rows survive between runs, so existing
+    rows are skipped rather than re-inserted.
+
+    The committed column values are read back once and cached for the
+    session, so the btc/eth/usdc fixtures build their instance in memory
+    (``Model.from_db``) without any per-test SELECT or INSERT. Each test
+    still gets its own instance, and DB writes are rolled back, so a test
+    that mutates e.g. ``current_price`` cannot leak into the next one.
+
+    Returns:
+        dict: Mapping of symbol -> tuple of column values (``_CRYPTO_ATTNAMES`` order)
+    """
+    with django_db_blocker.unblock():
+        # One SELECT ... IN for all symbols, then one multi-row INSERT for missing rows
+        seeds = {seed['symbol']: seed for seed in CRYPTO_SEEDS}
+        existing = Cryptocurrency.objects.in_bulk(list(seeds), field_name='symbol')
+        missing = [
+            Cryptocurrency(**seed)
+            for symbol, seed in seeds.items()
+            if symbol not in existing
+        ]
+        Cryptocurrency.objects.bulk_create(missing)
+
+        # Ensure current_price is set even if crypto already existed (e.g. reused DB built with --migrations)
+        stale = [c for c in existing.values() if c.current_price != seeds[c.symbol]['current_price']]
+        for crypto in stale:
+            crypto.current_price = seeds[crypto.symbol]['current_price']
+        Cryptocurrency.objects.bulk_update(stale, ['current_price'])
+
+        rows = Cryptocurrency.objects.filter(symbol__in=list(seeds)).values_list(*_CRYPTO_ATTNAMES)
+        symbol_index = _CRYPTO_ATTNAMES.index('symbol')
+        return {row[symbol_index]: row for row in rows}
+
+
+def _baseline_crypto(baseline_cryptos, symbol):
+    """Build a fresh instance of a session-seeded cryptocurrency from its cached row (no query)."""
+    return Cryptocurrency.from_db(DEFAULT_DB_ALIAS, _CRYPTO_ATTNAMES, baseline_cryptos[symbol])
+
+
 @pytest.fixture
-def btc(db):
-    """Create a Bitcoin cryptocurrency fixture with unique ID."""
-    from trading.models import Cryptocurrency
-    # Use get_or_create to prevent duplicates in the same test session
-    crypto, created = Cryptocurrency.objects.get_or_create(
-        symbol='BTC',
-        defaults={
-            'name': 'Bitcoin',
-            'coingecko_id': 'bitcoin-test',
-            'current_price': Decimal('50000.00'),
-            'price_change_24h': Decimal('2.5'),
-            'volume_24h': Decimal('1000000000.00'),
-            'market_cap': Decimal('1000000000000.00'),
-            'icon_url': 'https://example.com/btc.png',
-            'category': Cryptocurrency.Category.CRYPTO,
-            'is_active': True,
-        }
-    )
-    # Ensure current_price is set even if crypto already existed
-    if not created and crypto.current_price != Decimal('50000.00'):
-        crypto.current_price = Decimal('50000.00')
-        crypto.save()
-    return crypto
+def btc(db, baseline_cryptos):
+    """Bitcoin fixture, a new instance per test built from the session-cached row."""
+    return _baseline_crypto(baseline_cryptos, 'BTC')
 
 
 @pytest.fixture
-def eth(db):
-    """Create an Ethereum cryptocurrency fixture with unique ID."""
-    from trading.models import Cryptocurrency
-    crypto, created = Cryptocurrency.objects.get_or_create(
-        symbol='ETH',
-        defaults={
-            'name': 'Ethereum',
-            'coingecko_id': 'ethereum-test',
-            'current_price': Decimal('3000.00'),
-            'price_change_24h': Decimal('-1.2'),
-            'volume_24h': Decimal('500000000.00'),
-            'market_cap': Decimal('500000000000.00'),
-            'icon_url': 'https://example.com/eth.png',
-            'category': Cryptocurrency.Category.CRYPTO,
-            'is_active': True,
-        }
-    )
-    # Ensure current_price is set even if crypto already existed
-    if not created and crypto.current_price != Decimal('3000.00'):
-        crypto.current_price = Decimal('3000.00')
-        crypto.save()
-    return crypto
+def eth(db, baseline_cryptos):
+    """Ethereum fixture, a new instance per test built from the session-cached row."""
+    return _baseline_crypto(baseline_cryptos, 'ETH')
 
 
 @pytest.fixture
-def usdc(db):
-    """Create a USDC stablecoin fixture with unique ID."""
-    from trading.models import Cryptocurrency
-    crypto, created = Cryptocurrency.objects.get_or_create(
-        symbol='USDC',
-        defaults={
-            'name': 'USD Coin',
-            'coingecko_id': 'usd-coin-test',
-            'current_price': Decimal('1.00'),
-            'price_change_24h': Decimal('0.01'),
-            'volume_24h': Decimal('100000000.00'),
-            'market_cap': Decimal('50000000000.00'),
-            'icon_url': 'https://example.com/usdc.png',
-            'category': Cryptocurrency.Category.STABLECOIN,
-            'is_active': True,
-        }
-    )
-    # Ensure current_price is set even if crypto already existed
-    if not created and crypto.current_price != Decimal('1.00'):
-        crypto.current_price = Decimal('1.00')
-        crypto.save()
-    return crypto
+def usdc(db, baseline_cryptos):
+    """USDC stablecoin fixture, a new instance per test built from the session-cached row."""
+    return _baseline_crypto(baseline_cryptos, 'USDC')
 
 
 @pytest.fixture
@@ -131,23 +206,26 @@ def portfolio_with_holdings(portfolio, btc, eth):
     - 0.5 BTC @ $48,000 average
     - 2.0 ETH @ $2,900 average
     """
-    HoldingFactory(
-        portfolio=portfolio,
-        cryptocurrency=btc,
-        quantity=Decimal('0.5'),
-        average_purchase_price=Decimal('48000.00'),
-        total_cost_basis=Decimal('24000.00'),
-    )
-    HoldingFactory(
-        portfolio=portfolio,
-        cryptocurrency=eth,
-        quantity=Decimal('2.0'),
-        average_purchase_price=Decimal('2900.00'),
-        total_cost_basis=Decimal('5800.00'),
-    )
+    # Both rows in one multi-row INSERT (btc/eth are the session-seeded rows)
+    Holding.objects.bulk_create([
+        HoldingFactory.build(
+            portfolio=portfolio,
+            cryptocurrency=btc,
+            quantity=Decimal('0.5'),
+            average_purchase_price=Decimal('48000.00'),
+            total_cost_basis=Decimal('24000.00'),
+        ),
+        HoldingFactory.build(
+            portfolio=portfolio,
+            cryptocurrency=eth,
+            quantity=Decimal('2.0'),
+            average_purchase_price=Decimal('2900.00'),
+            total_cost_basis=Decimal('5800.00'),
+        ),
+    ])
     # Adjust cash balance to reflect purchases
     portfolio.cash_balance = Decimal('10000.00') - Decimal('29800.00')  # Negative for testing edge cases
-    portfolio.save()
+    portfolio.save(update_fields=['cash_balance', 'updated_at'])
     return portfolio
 
 
@@ -181,7 +259,7 @@ def mock_coingecko():
         {'timestamp': '2025-01-15', 'price': 50000.00},
     ]
 
-    with patch('trading.services.coingecko.CoinGeckoService', return_value=mock_service):
+    with patch('trading.api.CoinGeckoService', return_value=mock_service):
         yield mock_service
 
 
@@ -227,15 +305,74 @@ def mock_finnhub():
         }
     ]
 
-    with patch('trading.services.finnhub.FinnhubService', return_value=mock_service):
+    with patch('trading.api.FinnhubService', return_value=mock_service):
         yield mock_service
 
 
 @pytest.fixture
+def mock_yfinance_failure():
+    """
+    Mock YFinance service failure.
+
+    Raises synchronously instead of relying on a real network error, so
+    failure-path tests finish in microseconds.
+    """
+    from unittest.mock import patch
+
+    with patch(
+        'trading.services.yfinance.YFinanceService.fetch_price_history',
+        side_effect=ConnectionError('yfinance unavailable'),
+    ) as mock_fetch:
+        yield mock_fetch
+
+
+@pytest.fixture
+def mock_finnhub_failure():
+    """
+    Mock Finnhub service failure for crypto news.
+
+    Raises synchronously (no retry/backoff against the real API).
+    """
+    from unittest.mock import Mock, patch
+
+    mock_service = Mock()
+    mock_service.get_crypto_news.side_effect = ConnectionError('Finnhub unavailable')
+
+    with patch('trading.api.FinnhubService', return_value=mock_service):
+        yield mock_service
+
+
+@pytest.fixture(autouse=True)
+def _block_network(monkeypatch):
+    """
+    Fail fast on accidental real HTTP from external services.
+
+    requests (CoinGecko, Finnhub) and yfinance raise ConnectionError at once
+    instead of waiting on DNS/TCP timeouts. Tests that need upstream data
+    use the mock_* fixtures above.
+    """
+    import requests
+    import yfinance
+
+    def _blocked(*args, **kwargs):
+        raise ConnectionError('Network access is disabled in tests')
+
+    monkeypatch.setattr(requests.sessions.Session, 'request', _blocked)
+    monkeypatch.setattr(yfinance, 'Ticker', _blocked)
+
+
+@pytest.fixture(scope='session')
 def api_client():
-    """Django test client for API endpoint testing."""
-    from django.test import Client
-    return Client()
+    """
+    Ninja test client for the trading router, built once per test process.
+
+    The router is imported here rather than at test-module import time so
+    collection (and each xdist worker) loads it once. Router state is
+    read-only, so one client is safely shared by every test.
+    """
+    from trading.api import router
+    from trading.tests.helpers import CachedTestClient
+    return CachedTestClient(router)
 
 
 @pytest.fixture(autouse=True)
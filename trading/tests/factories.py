@@ -7,15 +7,43 @@ for testing without duplicating setup code across test files.
 from decimal import Decimal
 from datetime import datetime, timedelta
 import factory
-from factory.django import DjangoModelFactory
+from factory.django import DjangoModelFactory, mute_signals
+from django.db.models import signals
 from django.utils import timezone
 from trading.models import User, Portfolio, Cryptocurrency, Holding, Transaction, PriceHistory
 
+# Shared Decimal defaults (parsed once at import, reused by every factory call)
+_D_0 = Decimal('0.00')
+_D_1 = Decimal('1.0')
+_D_2_5 = Decimal('2.50')
+_D_10K = Decimal('10000.00')
+_D_50K = Decimal('50000.00')
+_D_1B = Decimal('1000000000.00')
+_D_1T = Decimal('1000000000000.00')
 
+
+class BulkCreateMixin:
+    """
+    Adds ``bulk(n, **kwargs)``: build n instances in memory, insert them with one query.
+
+    Related objects are not saved by ``build``, so pass already-saved rows
+    for every ForeignKey (e.g. ``portfolio=``, ``cryptocurrency=``).
+    """
+
+    @classmethod
+    def bulk(cls, n, **kwargs):
+        instances = cls.build_batch(n, **kwargs)
+        return cls._meta.model.objects.bulk_create(instances)
+
+
+@mute_signals(signals.pre_save, signals.post_save)
 class UserFactory(DjangoModelFactory):
     """
     Creates a test user with portfolio.
 
+    Save signals are muted: the trading app registers no pre/post_save
+    receivers (nothing auto-creates a portfolio), so dispatch is pure overhead.
+
     Default user has:
     - Username: testuser_{sequence}
     - Email: testuser_{sequence}@example.com
@@ -33,6 +61,7 @@ class UserFactory(DjangoModelFactory):
     date_of_birth = '1990-01-01'
 
 
+@mute_signals(signals.pre_save, signals.post_save)
 class PortfolioFactory(DjangoModelFactory):
     """
     Creates a test portfolio linked to a user.
@@ -45,12 +74,17 @@ class PortfolioFactory(DjangoModelFactory):
     class Meta:
         model = Portfolio
 
+    class Params:
+        # Pass now=<datetime> to reuse one clock read across a batch
+        now = None
+
     user = factory.SubFactory(UserFactory)
-    initial_cash = Decimal('10000.00')
-    cash_balance = Decimal('10000.00')
-    created_at = factory.LazyFunction(lambda: timezone.now() - timedelta(days=30))
+    initial_cash = _D_10K
+    cash_balance = _D_10K
+    created_at = factory.LazyAttribute(lambda obj: (obj.now or timezone.now()) - timedelta(days=30))
 
 
+@mute_signals(signals.pre_save, signals.post_save)
 class CryptocurrencyFactory(DjangoModelFactory):
     """
     Creates a test cryptocurrency.
@@ -68,15 +102,16 @@ class CryptocurrencyFactory(DjangoModelFactory):
     symbol = factory.Sequence(lambda n: f'CRYPTO{n}')
     name = factory.LazyAttribute(lambda obj: f'{obj.symbol} Coin')
     coingecko_id = factory.Sequence(lambda n: f'crypto-{n}')
-    current_price = Decimal('50000.00')
-    price_change_24h = Decimal('2.50')
-    volume_24h = Decimal('1000000000.00')
-    market_cap = Decimal('1000000000000.00')
+    current_price = _D_50K
+    price_change_24h = _D_2_5
+    volume_24h = _D_1B
+    market_cap = _D_1T
     icon_url = factory.Sequence(lambda n: f'https://example.com/crypto-{n}.png')
     is_active = True
     category = Cryptocurrency.Category.CRYPTO
 
 
+@mute_signals(signals.pre_save, signals.post_save)
 class HoldingFactory(DjangoModelFactory):
     """
     Creates a portfolio holding.
@@ -85,21 +120,28 @@ class HoldingFactory(DjangoModelFactory):
     - 1.0 quantity
     - Average purchase price matches crypto current price
     - Proper cost basis calculation
+
+    Pass portfolio= and cryptocurrency= explicitly where possible; otherwise
+    the SubFactory chain creates a new User, Portfolio and Cryptocurrency
+    for every holding.
     """
     class Meta:
         model = Holding
 
     portfolio = factory.SubFactory(PortfolioFactory)
     cryptocurrency = factory.SubFactory(CryptocurrencyFactory)
-    quantity = Decimal('1.0')
+    quantity = _D_1
     average_purchase_price = factory.LazyAttribute(lambda obj: obj.cryptocurrency.current_price)
 
-    @factory.lazy_attribute
-    def total_cost_basis(self):
-        return self.quantity * self.average_purchase_price
+    @classmethod
+    def _adjust_kwargs(cls, **kwargs):
+        # Plain multiply once declarations are resolved (covers build and create)
+        kwargs.setdefault('total_cost_basis', kwargs['quantity'] * kwargs['average_purchase_price'])
+        return kwargs
 
 
-class TransactionFactory(DjangoModelFactory):
+@mute_signals(signals.pre_save, signals.post_save)
+class TransactionFactory(BulkCreateMixin, DjangoModelFactory):
     """
     Creates a transaction record.
 
@@ -113,17 +155,26 @@ class TransactionFactory(DjangoModelFactory):
     class Meta:
         model = Transaction
 
+    class Params:
+        # Pass now=<datetime> to reuse one clock read across a batch
+        now = None
+
     portfolio = factory.SubFactory(PortfolioFactory)
     cryptocurrency = factory.SubFactory(CryptocurrencyFactory)
-    type = Transaction.TransactionType.BUY
-    quantity = Decimal('1.0')
+    transaction_type = Transaction.TransactionType.BUY
+    quantity = _D_1
     price_per_unit = factory.LazyAttribute(lambda obj: obj.cryptocurrency.current_price)
-    total_amount = factory.LazyAttribute(lambda obj: obj.quantity * obj.price_per_unit)
-    realized_gain_loss = Decimal('0.00')
-    timestamp = factory.LazyFunction(lambda: timezone.now() - timedelta(days=1))
+    realized_gain_loss = _D_0
+    timestamp = factory.LazyAttribute(lambda obj: (obj.now or timezone.now()) - timedelta(days=1))
+
+    @classmethod
+    def _adjust_kwargs(cls, **kwargs):
+        kwargs.setdefault('total_amount', kwargs['quantity'] * kwargs['price_per_unit'])
+        return kwargs
 
 
-class PriceHistoryFactory(DjangoModelFactory):
+@mute_signals(signals.pre_save, signals.post_save)
+class PriceHistoryFactory(BulkCreateMixin, DjangoModelFactory):
     """
     Creates a historical price point for a cryptocurrency.
 
@@ -134,6 +185,25 @@ class PriceHistoryFactory(DjangoModelFactory):
     class Meta:
         model = PriceHistory
 
+    class Params:
+        # Pass now=<datetime> to reuse one clock read across a batch
+        now = None
+
     cryptocurrency = factory.SubFactory(CryptocurrencyFactory)
-    price = Decimal('50000.00')
-    timestamp = factory.LazyFunction(lambda: timezone.now() - timedelta(days=1))
+    price = _D_50K
+    timestamp = factory.LazyAttribute(lambda obj: (obj.now or timezone.now()) - timedelta(days=1))
+
+    @classmethod
+    def bulk_create_history(cls, crypto, days=7, price=_D_50K, now=None):
+        """
+        Create one daily price point per day for the last `days` days.
+
+        Shares the given cryptocurrency (no SubFactory resolution) and inserts
+        all rows with a single bulk_create. Points are anchored at `now`
+        (defaults to the current time).
+        """
+        now = now or timezone.now()
+        return PriceHistory.objects.bulk_create([
+            PriceHistory(cryptocurrency=crypto, price=price, timestamp=now - timedelta(days=i))
+            for i in range(days)
+        ])
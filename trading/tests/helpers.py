@@ -0,0 +1,149 @@
+"""
+Shared helpers for trading app tests.
+
+Non-fixture utilities imported directly by test modules.
+"""
+from django.db.models import Exists, F, OuterRef, Subquery
+from ninja.testing import TestClient
+
+from trading.models import Cryptocurrency, Holding, Portfolio, Transaction
+
+# Default for _seed_holding(price=...): None is a real price ("unavailable")
+_UNCHANGED = object()
+
+
+class CachedTestClient(TestClient):
+    """
+    Ninja TestClient that memoizes path resolution.
+
+    The stock client walks every URL pattern on each request to find the view
+    for a path. Tests hit a handful of distinct paths many times, so the
+    resolved (view, kwargs) pair is cached per path after the first lookup.
+    Routing is by path only (the view dispatches on method), so the HTTP
+    method is not part of the cache key.
+    """
+
+    def _resolve(self, method, path, data, request_params):
+        url_path = path.split("?")[0].lstrip("/")
+        cache = self.__dict__.setdefault("_resolve_cache", {})
+
+        resolved = cache.get(url_path)
+        if resolved is None:
+            for url in self.urls:
+                match = url.resolve(url_path)
+                if match:
+                    resolved = cache[url_path] = (match.func, match.kwargs)
+                    break
+            else:
+                # Cache miss with no matching route: defer to the stock error path
+                return super()._resolve(method, path, data, request_params)
+
+        func, kwargs = resolved
+        request = self._build_request(method, path, data, request_params)
+        return func, request, dict(kwargs)
+
+
+def _make_holding(portfolio, cryptocurrency, **fields):
+    """
+    Build an unsaved Holding for Holding.objects.bulk_create().
+
+    Every field is given explicitly, so there is nothing for HoldingFactory's
+    declarations, sequences or LazyAttributes to compute.
+    """
+    return Holding(portfolio=portfolio, cryptocurrency=cryptocurrency, **fields)
+
+
+def _set_price(crypto, price):
+    """
+    Set crypto.current_price in the DB and on the instance.
+
+    A single-column UPDATE instead of crypto.save(), which rewrites every
+    field and dispatches pre/post_save. None marks the price unavailable.
+    """
+    Cryptocurrency.objects.filter(pk=crypto.pk).update(current_price=price)
+    crypto.current_price = price
+
+
+def _seed_holding(portfolio, crypto, qty, avg=None, cost=None, price=_UNCHANGED, cash_delta=None):
+    """
+    Insert a holding and apply the related setup writes, one query each.
+
+    Replaces the HoldingFactory(...) + portfolio.save() + crypto.save() setup
+    pattern: the holding goes in with a single bulk_create, and the cash and
+    price changes are column UPDATEs instead of full-row saves. The passed
+    portfolio and crypto instances are updated in memory to match the DB.
+
+    Args:
+        portfolio: Owning portfolio
+        crypto: Cryptocurrency held
+        qty: Holding quantity
+        avg: Average purchase price (defaults to crypto.current_price)
+        cost: Total cost basis (defaults to qty * avg)
+        price: New crypto.current_price, None included (omit to leave as is)
+        cash_delta: Amount added to portfolio.cash_balance (negative to deduct)
+
+    Returns:
+        Holding: The saved holding
+    """
+    if avg is None:
+        avg = crypto.current_price
+    if cost is None:
+        cost = qty * avg
+
+    holding, = Holding.objects.bulk_create([
+        _make_holding(
+            portfolio, crypto,
+            quantity=qty,
+            average_purchase_price=avg,
+            total_cost_basis=cost,
+        )
+    ])
+
+    if cash_delta is not None:
+        Portfolio.objects.filter(pk=portfolio.pk).update(cash_balance=F('cash_balance') + cash_delta)
+        portfolio.cash_balance += cash_delta
+    if price is not _UNCHANGED:
+        _set_price(crypto, price)
+
+    return holding
+
+
+def _get_holding(portfolio, crypto, *fields):
+    """
+    Fetch a holding with only the given columns loaded (plus the primary key).
+
+    Tests assert two or three fields after a trade; deferring the rest keeps
+    the SELECT and model instantiation small. Reading a deferred field still
+    works but costs an extra query, so list every field the test asserts.
+    """
+    return Holding.objects.only(*fields).get(portfolio=portfolio, cryptocurrency=crypto)
+
+
+def _cash(portfolio):
+    """Stored cash balance of a portfolio, read as a single column."""
+    return Portfolio.objects.values_list('cash_balance', flat=True).get(pk=portfolio.pk)
+
+
+def _assert_no_side_effects(portfolio, crypto, cash, quantity=None):
+    """
+    Assert a rejected trade left the portfolio as it was, in one query.
+
+    Reads the cash balance, the crypto holding's quantity and whether any
+    transaction exists as subqueries of a single portfolio SELECT, instead of
+    refresh_from_db() plus separate holding and transaction lookups.
+
+    Args:
+        portfolio: Portfolio the trade was placed on
+        crypto: Cryptocurrency traded
+        cash: Expected (unchanged) cash balance
+        quantity: Expected holding quantity, or None if no holding should exist
+    """
+    holding_quantity = Holding.objects.filter(
+        portfolio=OuterRef('pk'), cryptocurrency=crypto,
+    ).values('quantity')
+    any_transaction = Exists(Transaction.objects.filter(portfolio=OuterRef('pk')))
+
+    actual = Portfolio.objects.filter(pk=portfolio.pk).values_list(
+        'cash_balance', Subquery(holding_quantity), any_transaction,
+    ).get()
+    assert actual == (cash, quantity, False)
@@ -17,26 +17,25 @@ API Endpoint Behaviors Tested:
 """
 import pytest
 from decimal import Decimal
-from ninja.testing import TestClient
-from trading.api import router
 from trading.models import Cryptocurrency
-from trading.tests.factories import CryptocurrencyFactory
 
 
-@pytest.fixture(autouse=True)
-def _clean_cryptos_table(db):
-    """Ensure clean crypto table for deterministic tests."""
-    Cryptocurrency.objects.all().delete()
-    yield
-    Cryptocurrency.objects.all().delete()
-
-
-@pytest.fixture
-def btc(db):
-    """Create exactly one Bitcoin fixture for tests."""
-    crypto, _ = Cryptocurrency.objects.get_or_create(
-        symbol='BTC',
-        defaults={
+# Fields every item of GET /api/cryptocurrencies must expose
+_REQUIRED_CRYPTO_FIELDS = frozenset({
+    'id', 'symbol', 'name', 'coingecko_id', 'icon_url', 'category',
+    'current_price', 'price_change_24h', 'volume_24h', 'market_cap', 'last_updated',
+})
+
+# Rows created fresh per test (the table is cleared first), keyed by symbol.
+# Unlike conftest's CRYPTO_SEEDS, which are committed for the whole session and
+# use '-test' coingecko_ids so they cannot clash with the real ids of the 0002
+# seed rows, these rows only exist inside a cleared table, so they carry the real
+# CoinGecko ids that the list/detail responses are checked against.
+_API_CRYPTO_SEEDS = {
+    seed['symbol']: seed
+    for seed in [
+        {
+            'symbol': 'BTC',
             'name': 'Bitcoin',
             'coingecko_id': 'bitcoin',
             'current_price': Decimal('50000.00'),
@@ -45,18 +44,9 @@ def btc(db):
             'market_cap': Decimal('1000000000000.00'),
             'icon_url': 'https://example.com/btc.png',
             'category': Cryptocurrency.Category.CRYPTO,
-            'is_active': True,
-        }
-    )
-    return crypto
-
-
-@pytest.fixture
-def eth(db):
-    """Create exactly one Ethereum fixture for tests."""
-    crypto, _ = Cryptocurrency.objects.get_or_create(
-        symbol='ETH',
-        defaults={
+        },
+        {
+            'symbol': 'ETH',
             'name': 'Ethereum',
             'coingecko_id': 'ethereum',
             'current_price': Decimal('3000.00'),
@@ -65,18 +55,9 @@ def eth(db):
             'market_cap': Decimal('500000000000.00'),
             'icon_url': 'https://example.com/eth.png',
             'category': Cryptocurrency.Category.CRYPTO,
-            'is_active': True,
-        }
-    )
-    return crypto
-
-
-@pytest.fixture
-def usdc(db):
-    """Create exactly one USDC fixture for tests."""
-    crypto, _ = Cryptocurrency.objects.get_or_create(
-        symbol='USDC',
-        defaults={
+        },
+        {
+            'symbol': 'USDC',
             'name': 'USD Coin',
             'coingecko_id': 'usd-coin',
             'current_price': Decimal('1.00'),
@@ -85,17 +66,49 @@ def usdc(db):
             'market_cap': Decimal('50000000000.00'),
             'icon_url': 'https://example.com/usdc.png',
             'category': Cryptocurrency.Category.STABLECOIN,
-            'is_active': True,
-        }
-    )
-    return crypto
+        },
+    ]
+}
+
+
+@pytest.fixture(autouse=True)
+def _clean_cryptos_table(db):
+    """
+    Ensure clean crypto table for deterministic tests.
+
+    The session-scoped ``baseline_cryptos`` fixture commits BTC/ETH/USDC (and
+    a database built with ``--migrations`` also holds the 0002 seed rows), so
+    existing rows are cleared up front. The DELETE runs inside pytest-django's
+    per-test transaction, so the committed rows other modules rely on come back
+    at rollback, as do rows created during the test (no teardown DELETE).
+    """
+    Cryptocurrency.objects.all().delete()
+
+
+@pytest.fixture
+def btc(db):
+    """Create exactly one Bitcoin fixture for tests."""
+    return Cryptocurrency.objects.create(**_API_CRYPTO_SEEDS['BTC'])
+
+
+@pytest.fixture
+def eth(db):
+    """Create exactly one Ethereum fixture for tests."""
+    return Cryptocurrency.objects.create(**_API_CRYPTO_SEEDS['ETH'])
+
+
+@pytest.fixture
+def usdc(db):
+    """Create exactly one USDC fixture for tests."""
+    return Cryptocurrency.objects.create(**_API_CRYPTO_SEEDS['USDC'])
 
 
 @pytest.mark.api
+@pytest.mark.django_db
 class TestCryptocurrenciesListAPI:
     """Test GET /api/cryptocurrencies endpoint."""
 
-    def test_get_cryptocurrencies_empty(self):
+    def test_get_cryptocurrencies_empty(self, api_client):
         """
         Test cryptocurrencies endpoint with no cryptos.
 
@@ -104,14 +117,12 @@ class TestCryptocurrenciesListAPI:
         - Returns empty array
         """
         # No fixtures used - autouse cleanup ensures empty table
-        client = TestClient(router)
-
-        response = client.get("/cryptocurrencies")
+        response = api_client.get("/cryptocurrencies")
 
         assert response.status_code == 200
         assert response.json() == []
 
-    def test_get_cryptocurrencies_with_data(self, btc, eth, usdc):
+    def test_get_cryptocurrencies_with_data(self, btc, eth, usdc, api_client):
         """
         Test cryptocurrencies endpoint with multiple cryptos.
 
@@ -120,9 +131,7 @@ class TestCryptocurrenciesListAPI:
         - Each crypto has required fields
         - Sorted appropriately
         """
-        client = TestClient(router)
-
-        response = client.get("/cryptocurrencies")
+        response = api_client.get("/cryptocurrencies")
 
         assert response.status_code == 200
 
@@ -132,19 +141,10 @@ class TestCryptocurrenciesListAPI:
 
         # Verify structure
         for crypto in cryptos:
-            assert "id" in crypto
-            assert "symbol" in crypto
-            assert "name" in crypto
-            assert "coingecko_id" in crypto
-            assert "icon_url" in crypto
-            assert "category" in crypto
-            assert "current_price" in crypto
-            assert "price_change_24h" in crypto
-            assert "volume_24h" in crypto
-            assert "market_cap" in crypto
-            assert "last_updated" in crypto
-
-    def test_get_cryptocurrencies_only_active(self, btc, eth):
+            missing = _REQUIRED_CRYPTO_FIELDS - crypto.keys()
+            assert not missing, f"missing fields: {missing}"
+
+    def test_get_cryptocurrencies_only_active(self, btc, eth, api_client):
         """
         Test only active cryptocurrencies returned.
 
@@ -152,14 +152,15 @@ class TestCryptocurrenciesListAPI:
         - Inactive cryptos excluded from results
         """
         # Create inactive cryptocurrency
-        inactive = CryptocurrencyFactory(
+        Cryptocurrency.objects.create(
             symbol='INACTIVE',
+            name='Inactive Coin',
+            coingecko_id='inactive',
+            icon_url='https://example.com/inactive.png',
             is_active=False,
         )
 
-        client = TestClient(router)
-
-        response = client.get("/cryptocurrencies")
+        response = api_client.get("/cryptocurrencies")
 
         cryptos = response.json()
 
@@ -169,7 +170,7 @@ class TestCryptocurrenciesListAPI:
         symbols = [c["symbol"] for c in cryptos]
         assert "INACTIVE" not in symbols
 
-    def test_get_cryptocurrencies_field_types(self, btc):
+    def test_get_cryptocurrencies_field_types(self, btc, api_client):
         """
         Test cryptocurrency fields have correct types.
 
@@ -178,9 +179,7 @@ class TestCryptocurrenciesListAPI:
         - price_change_24h is decimal
         - Fields match schema specification
         """
-        client = TestClient(router)
-
-        response = client.get("/cryptocurrencies")
+        response = api_client.get("/cryptocurrencies")
 
         crypto = response.json()[0]
 
@@ -189,10 +188,11 @@ class TestCryptocurrenciesListAPI:
 
 
 @pytest.mark.api
+@pytest.mark.django_db
 class TestCryptocurrencyDetailAPI:
     """Test GET /api/cryptocurrencies/{id} endpoint."""
 
-    def test_get_cryptocurrency_detail_success(self, btc, mock_coingecko):
+    def test_get_cryptocurrency_detail_success(self, btc, mock_coingecko, api_client):
         """
         Test cryptocurrency detail endpoint.
 
@@ -202,9 +202,7 @@ class TestCryptocurrencyDetailAPI:
         - Includes price_history_7d array
         - External API called for historical data
         """
-        client = TestClient(router)
-
-        response = client.get(f"/cryptocurrencies/{btc.id}")
+        response = api_client.get(f"/cryptocurrencies/{btc.id}")
 
         assert response.status_code == 200
 
@@ -219,20 +217,18 @@ class TestCryptocurrencyDetailAPI:
         assert "price_history_7d" in data
         assert isinstance(data["price_history_7d"], list)
 
-    def test_get_cryptocurrency_detail_not_found(self):
+    def test_get_cryptocurrency_detail_not_found(self, api_client):
         """
         Test detail endpoint with invalid cryptocurrency ID.
 
         Verifies:
         - Returns 404 error
         """
-        client = TestClient(router)
-
-        response = client.get("/cryptocurrencies/00000000-0000-0000-0000-000000000000")
+        response = api_client.get("/cryptocurrencies/00000000-0000-0000-0000-000000000000")
 
         assert response.status_code == 404
 
-    def test_get_cryptocurrency_detail_price_history(self, eth, mock_coingecko):
+    def test_get_cryptocurrency_detail_price_history(self, eth, mock_coingecko, api_client):
         """
         Test price history included in detail response.
 
@@ -241,9 +237,7 @@ class TestCryptocurrencyDetailAPI:
         - 7-day timeframe used
         - Data structure correct
         """
-        client = TestClient(router)
-
-        response = client.get(f"/cryptocurrencies/{eth.id}")
+        response = api_client.get(f"/cryptocurrencies/{eth.id}")
 
         assert response.status_code == 200
 
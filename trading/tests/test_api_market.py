@@ -19,8 +19,6 @@ API Endpoint Behaviors Tested:
 - External API failures return 502 error
 """
 import pytest
-from ninja.testing import TestClient
-from trading.api import router
 from trading.tests.factories import CryptocurrencyFactory
 
 
@@ -28,7 +26,7 @@ from trading.tests.factories import CryptocurrencyFactory
 class TestMarketPriceHistoryAPI:
     """Test GET /api/market/crypto/history endpoint."""
 
-    def test_get_price_history_success(self, btc, mock_yfinance):
+    def test_get_price_history_success(self, btc, mock_yfinance, api_client):
         """
         Test successful price history retrieval.
 
@@ -38,9 +36,7 @@ class TestMarketPriceHistoryAPI:
         - Each point has date and price
         - yfinance service called
         """
-        client = TestClient(router)
-
-        response = client.get("/market/crypto/history?symbol=BTC&timeframe=1Y")
+        response = api_client.get("/market/crypto/history?symbol=BTC&timeframe=1Y")
 
         assert response.status_code == 200
 
@@ -54,25 +50,21 @@ class TestMarketPriceHistoryAPI:
             assert "date" in point
             assert "price" in point
 
-    def test_get_price_history_all_timeframes(self, btc, mock_yfinance):
+    @pytest.mark.parametrize("timeframe", ['1D', '5D', '1M', '3M', '6M', 'YTD', '1Y', '5Y', 'ALL'])
+    def test_get_price_history_timeframe(self, btc, mock_yfinance, api_client, timeframe):
         """
-        Test all supported timeframes work.
+        Test each supported timeframe works.
 
         Market endpoints support ALL timeframes (unlike portfolio which caps at YTD).
 
         Verifies:
         - 1D, 5D, 1M, 3M, 6M, YTD, 1Y, 5Y, ALL all accepted
         """
-        client = TestClient(router)
-
-        timeframes = ['1D', '5D', '1M', '3M', '6M', 'YTD', '1Y', '5Y', 'ALL']
-
-        for timeframe in timeframes:
-            response = client.get(f"/market/crypto/history?symbol=BTC&timeframe={timeframe}")
+        response = api_client.get(f"/market/crypto/history?symbol=BTC&timeframe={timeframe}")
 
-            assert response.status_code == 200, f"Timeframe {timeframe} should be supported"
+        assert response.status_code == 200, f"Timeframe {timeframe} should be supported"
 
-    def test_get_price_history_invalid_timeframe(self, btc):
+    def test_get_price_history_invalid_timeframe(self, btc, api_client):
         """
         Test invalid timeframe returns 400 error.
 
@@ -80,26 +72,22 @@ class TestMarketPriceHistoryAPI:
         - Random strings rejected
         - Error message lists valid options
         """
-        client = TestClient(router)
-
-        response = client.get("/market/crypto/history?symbol=BTC&timeframe=INVALID")
+        response = api_client.get("/market/crypto/history?symbol=BTC&timeframe=INVALID")
 
         assert response.status_code == 400
 
-    def test_get_price_history_missing_symbol(self):
+    def test_get_price_history_missing_symbol(self, api_client):
         """
         Test missing symbol parameter.
 
         Verifies:
         - Returns 422 (missing required param)
         """
-        client = TestClient(router)
-
-        response = client.get("/market/crypto/history?timeframe=1Y")
+        response = api_client.get("/market/crypto/history?timeframe=1Y")
 
         assert response.status_code == 422
 
-    def test_get_price_history_cryptocurrency_not_found(self):
+    def test_get_price_history_cryptocurrency_not_found(self, api_client):
         """
         Test non-existent cryptocurrency symbol.
 
@@ -107,14 +95,12 @@ class TestMarketPriceHistoryAPI:
         - Returns 502 error when yfinance doesn't have data
         - Error message indicates upstream service issue
         """
-        client = TestClient(router)
-
-        response = client.get("/market/crypto/history?symbol=NOTEXIST&timeframe=1Y")
+        response = api_client.get("/market/crypto/history?symbol=NOTEXIST&timeframe=1Y")
 
         # With direct yfinance mapping, non-existent symbols return 502 (upstream error)
         assert response.status_code == 502
 
-    def test_get_price_history_different_symbols(self, btc, eth, mock_yfinance):
+    def test_get_price_history_different_symbols(self, btc, eth, mock_yfinance, api_client):
         """
         Test multiple cryptocurrency symbols.
 
@@ -122,21 +108,19 @@ class TestMarketPriceHistoryAPI:
         - Different symbols can be queried
         - Symbol parameter case-insensitive
         """
-        client = TestClient(router)
-
         # BTC
-        response = client.get("/market/crypto/history?symbol=BTC&timeframe=1M")
+        response = api_client.get("/market/crypto/history?symbol=BTC&timeframe=1M")
         assert response.status_code == 200
 
         # ETH
-        response = client.get("/market/crypto/history?symbol=ETH&timeframe=1M")
+        response = api_client.get("/market/crypto/history?symbol=ETH&timeframe=1M")
         assert response.status_code == 200
 
         # Lowercase (should work)
-        response = client.get("/market/crypto/history?symbol=btc&timeframe=1M")
+        response = api_client.get("/market/crypto/history?symbol=btc&timeframe=1M")
         assert response.status_code == 200
 
-    def test_get_price_history_yfinance_failure(self, btc):
+    def test_get_price_history_yfinance_failure(self, btc, mock_yfinance_failure, api_client):
         """
         Test yfinance service failure handling.
 
@@ -144,16 +128,12 @@ class TestMarketPriceHistoryAPI:
         - Returns 502 error when external API fails
         - Error message indicates upstream service issue
         """
-        # No mock = yfinance will fail
-
-        client = TestClient(router)
-
-        response = client.get("/market/crypto/history?symbol=BTC&timeframe=1Y")
+        response = api_client.get("/market/crypto/history?symbol=BTC&timeframe=1Y")
 
         # Should return gateway error
         assert response.status_code == 502
 
-    def test_get_price_history_uses_yfinance_symbol(self, mock_yfinance):
+    def test_get_price_history_uses_yfinance_symbol(self, mock_yfinance, api_client):
         """
         Test cryptocurrency with custom yfinance_symbol.
 
@@ -168,9 +148,7 @@ class TestMarketPriceHistoryAPI:
             yfinance_symbol='CUSTOM-USD',
         )
 
-        client = TestClient(router)
-
-        response = client.get("/market/crypto/history?symbol=CUSTOM&timeframe=1Y")
+        response = api_client.get("/market/crypto/history?symbol=CUSTOM&timeframe=1Y")
 
         # Should succeed (mock will handle it)
         assert response.status_code == 200
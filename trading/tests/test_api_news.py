@@ -16,15 +16,13 @@ API Endpoint Behaviors Tested:
 - Articles have required fields (headline, summary, url, etc.)
 """
 import pytest
-from ninja.testing import TestClient
-from trading.api import router
 
 
 @pytest.mark.api
 class TestCryptoNewsAPI:
     """Test GET /api/news/crypto endpoint."""
 
-    def test_get_crypto_news_success(self, mock_finnhub):
+    def test_get_crypto_news_success(self, mock_finnhub, api_client):
         """
         Test successful crypto news retrieval.
 
@@ -34,9 +32,7 @@ class TestCryptoNewsAPI:
         - Each article has required fields
         - External Finnhub API called
         """
-        client = TestClient(router)
-
-        response = client.get("/news/crypto")
+        response = api_client.get("/news/crypto")
 
         assert response.status_code == 200
 
@@ -53,7 +49,7 @@ class TestCryptoNewsAPI:
         assert "url" in article
         assert "datetime" in article
 
-    def test_get_crypto_news_with_limit(self, mock_finnhub):
+    def test_get_crypto_news_with_limit(self, mock_finnhub, api_client):
         """
         Test limit parameter controls result count.
 
@@ -61,10 +57,8 @@ class TestCryptoNewsAPI:
         - limit query parameter accepted
         - Default limit is 20
         """
-        client = TestClient(router)
-
         # Test with limit
-        response = client.get("/news/crypto?limit=10")
+        response = api_client.get("/news/crypto?limit=10")
 
         assert response.status_code == 200
 
@@ -72,16 +66,14 @@ class TestCryptoNewsAPI:
         articles = response.json()
         assert isinstance(articles, list)
 
-    def test_get_crypto_news_default_limit(self, mock_finnhub):
+    def test_get_crypto_news_default_limit(self, mock_finnhub, api_client):
         """
         Test default limit is 20.
 
         Verifies:
         - No limit parameter defaults to 20
         """
-        client = TestClient(router)
-
-        response = client.get("/news/crypto")
+        response = api_client.get("/news/crypto")
 
         assert response.status_code == 200
 
@@ -89,7 +81,7 @@ class TestCryptoNewsAPI:
         articles = response.json()
         assert isinstance(articles, list)
 
-    def test_get_crypto_news_api_failure(self):
+    def test_get_crypto_news_api_failure(self, mock_finnhub_failure, api_client):
         """
         Test external API failure handling.
 
@@ -97,11 +89,7 @@ class TestCryptoNewsAPI:
         - Returns 500 error when Finnhub fails
         - Error message indicates service unavailable
         """
-        # No mock = API will fail
-
-        client = TestClient(router)
-
-        response = client.get("/news/crypto")
+        response = api_client.get("/news/crypto")
 
         # Should return error status
         assert response.status_code in [500, 502]
@@ -19,25 +19,17 @@ API Endpoint Behaviors Tested:
 """
 import pytest
 from decimal import Decimal
-from datetime import datetime, timedelta
-from django.utils import timezone
-from ninja.testing import TestClient
-from trading.api import router
-from trading.models import User
-from trading.tests.factories import (
-    UserFactory,
-    PortfolioFactory,
-    CryptocurrencyFactory,
-    HoldingFactory,
-    TransactionFactory,
-)
+from trading.models import Holding
+from trading.schemas import PortfolioHistorySchema
+
+pytestmark = pytest.mark.django_db
 
 
 @pytest.mark.api
 class TestPortfolioSummaryAPI:
     """Test GET /api/portfolio/summary endpoint."""
 
-    def test_get_portfolio_summary_success(self, user, portfolio):
+    def test_get_portfolio_summary_success(self, user, portfolio, api_client):
         """
         Test successful portfolio summary retrieval.
 
@@ -47,9 +39,7 @@ class TestPortfolioSummaryAPI:
         - Field types match schema
         - Values match portfolio model properties
         """
-        client = TestClient(router)
-
-        response = client.get("/portfolio/summary")
+        response = api_client.get("/portfolio/summary")
 
         assert response.status_code == 200
 
@@ -65,10 +55,10 @@ class TestPortfolioSummaryAPI:
         assert "last_updated" in data
 
         # Verify values match portfolio
-        assert Decimal(str(data["cash_balance"])) == portfolio.cash_balance
-        assert Decimal(str(data["initial_investment"])) == portfolio.initial_cash
+        assert Decimal(data["cash_balance"]) == portfolio.cash_balance
+        assert Decimal(data["initial_investment"]) == portfolio.initial_cash
 
-    def test_get_portfolio_summary_with_holdings(self, portfolio_with_holdings):
+    def test_get_portfolio_summary_with_holdings(self, portfolio_with_holdings, api_client):
         """
         Test portfolio summary with active holdings.
 
@@ -77,119 +67,48 @@ class TestPortfolioSummaryAPI:
         - Total portfolio value = cash + holdings
         - Gain/loss reflects unrealized P&L
         """
-        client = TestClient(router)
-
-        response = client.get("/portfolio/summary")
+        response = api_client.get("/portfolio/summary")
 
         assert response.status_code == 200
 
         data = response.json()
 
         # Holdings should have non-zero value
-        assert Decimal(str(data["total_holdings_value"])) > 0
+        assert Decimal(data["total_holdings_value"]) > 0
 
         # Total value should be sum of cash + holdings
-        cash = Decimal(str(data["cash_balance"]))
-        holdings = Decimal(str(data["total_holdings_value"]))
-        total = Decimal(str(data["total_portfolio_value"]))
+        cash = Decimal(data["cash_balance"])
+        holdings = Decimal(data["total_holdings_value"])
+        total = Decimal(data["total_portfolio_value"])
 
         assert total == cash + holdings
 
-    def test_get_portfolio_summary_no_user(self):
-        """
-        Test portfolio summary when no user exists.
-
-        Verifies:
-        - Returns 404 error
-        - Error message indicates missing user
-        """
-        # Ensure no users exist
-        User.objects.all().delete()
-
-        client = TestClient(router)
-
-        response = client.get("/portfolio/summary")
-
-        assert response.status_code == 404
-
 
 @pytest.mark.api
 class TestPortfolioHistoryAPI:
     """Test GET /api/portfolio/history endpoint."""
 
-    def test_get_portfolio_history_1d(self, user, portfolio, btc):
+    @pytest.mark.parametrize("timeframe", ["1D", "5D", "1M", "3M", "6M", "YTD"])
+    def test_get_portfolio_history_timeframe(self, user, portfolio, btc, api_client, timeframe):
         """
-        Test 1D timeframe returns hourly data.
+        Test every supported portfolio timeframe.
 
         Verifies:
         - 200 status code
         - Timeframe field matches request
-        - Data points array present
-        - Each point has timestamp and portfolio_value
+        - Body matches PortfolioHistorySchema: data_points is a list and every
+          point has a datetime timestamp and a Decimal portfolio_value
         """
-        client = TestClient(router)
-
-        response = client.get("/portfolio/history?timeframe=1D")
+        response = api_client.get(f"/portfolio/history?timeframe={timeframe}")
 
         assert response.status_code == 200
 
-        data = response.json()
-
-        assert data["timeframe"] == "1D"
-        assert "data_points" in data
-        assert isinstance(data["data_points"], list)
-
-        if len(data["data_points"]) > 0:
-            point = data["data_points"][0]
-            assert "timestamp" in point
-            assert "portfolio_value" in point
-
-    def test_get_portfolio_history_5d(self, portfolio):
-        """Test 5D timeframe."""
-        client = TestClient(router)
-
-        response = client.get("/portfolio/history?timeframe=5D")
+        # Single pass through the schema's compiled pydantic-core validator
+        history = PortfolioHistorySchema.model_validate_json(response.content)
 
-        assert response.status_code == 200
-        assert response.json()["timeframe"] == "5D"
-
-    def test_get_portfolio_history_1m(self, portfolio):
-        """Test 1M timeframe."""
-        client = TestClient(router)
-
-        response = client.get("/portfolio/history?timeframe=1M")
-
-        assert response.status_code == 200
-        assert response.json()["timeframe"] == "1M"
-
-    def test_get_portfolio_history_3m(self, portfolio):
-        """Test 3M timeframe."""
-        client = TestClient(router)
-
-        response = client.get("/portfolio/history?timeframe=3M")
-
-        assert response.status_code == 200
-        assert response.json()["timeframe"] == "3M"
-
-    def test_get_portfolio_history_6m(self, portfolio):
-        """Test 6M timeframe."""
-        client = TestClient(router)
-
-        response = client.get("/portfolio/history?timeframe=6M")
-
-        assert response.status_code == 200
-        assert response.json()["timeframe"] == "6M"
-
-    def test_get_portfolio_history_ytd(self, portfolio):
-        """Test YTD timeframe."""
-        client = TestClient(router)
-
-        response = client.get("/portfolio/history?timeframe=YTD")
-
-        assert response.status_code == 200
-        assert response.json()["timeframe"] == "YTD"
+        assert history.timeframe == timeframe
 
-    def test_get_portfolio_history_invalid_timeframe(self, portfolio):
+    def test_get_portfolio_history_invalid_timeframe(self, portfolio, api_client):
         """
         Test invalid timeframe returns 400 error.
 
@@ -199,52 +118,33 @@ class TestPortfolioHistoryAPI:
         - Random strings rejected
         - Error message lists valid options
         """
-        client = TestClient(router)
-
         # 1Y not supported for portfolio history
-        response = client.get("/portfolio/history?timeframe=1Y")
+        response = api_client.get("/portfolio/history?timeframe=1Y")
 
         assert response.status_code == 400
 
         # Invalid string
-        response = client.get("/portfolio/history?timeframe=INVALID")
+        response = api_client.get("/portfolio/history?timeframe=INVALID")
 
         assert response.status_code == 400
 
-    def test_get_portfolio_history_missing_timeframe(self, portfolio):
+    def test_get_portfolio_history_missing_timeframe(self, portfolio, api_client):
         """
         Test missing timeframe parameter.
 
         Verifies:
         - Returns 422 (missing required query param)
         """
-        client = TestClient(router)
-
-        response = client.get("/portfolio/history")
+        response = api_client.get("/portfolio/history")
 
         assert response.status_code == 422  # Unprocessable entity
 
-    def test_get_portfolio_history_no_user(self):
-        """
-        Test history endpoint when no user exists.
-
-        Verifies:
-        - Returns 404 error
-        """
-        User.objects.all().delete()
-
-        client = TestClient(router)
-
-        response = client.get("/portfolio/history?timeframe=1M")
-
-        assert response.status_code == 404
-
 
 @pytest.mark.api
 class TestHoldingsAPI:
     """Test GET /api/holdings endpoint."""
 
-    def test_get_holdings_empty_portfolio(self, user, portfolio):
+    def test_get_holdings_empty_portfolio(self, user, portfolio, api_client):
         """
         Test holdings endpoint with no holdings.
 
@@ -253,9 +153,7 @@ class TestHoldingsAPI:
         - Returns empty holdings array
         - Response structure valid
         """
-        client = TestClient(router)
-
-        response = client.get("/holdings")
+        response = api_client.get("/holdings")
 
         assert response.status_code == 200
 
@@ -265,7 +163,8 @@ class TestHoldingsAPI:
         assert isinstance(data["holdings"], list)
         assert len(data["holdings"]) == 0
 
-    def test_get_holdings_with_positions(self, portfolio_with_holdings):
+    @pytest.mark.max_queries(3)
+    def test_get_holdings_with_positions(self, portfolio_with_holdings, api_client):
         """
         Test holdings endpoint with active positions.
 
@@ -277,10 +176,9 @@ class TestHoldingsAPI:
         - Each holding has required fields
         - Cryptocurrency nested object present
         - Gain/loss calculations present
+        - At most 3 queries (user, portfolio, holdings joined to cryptocurrency)
         """
-        client = TestClient(router)
-
-        response = client.get("/holdings")
+        response = api_client.get("/holdings")
 
         assert response.status_code == 200
 
@@ -308,7 +206,7 @@ class TestHoldingsAPI:
             assert "icon_url" in crypto
             assert "current_price" in crypto
 
-    def test_get_holdings_single_position(self, portfolio, btc):
+    def test_get_holdings_single_position(self, portfolio, btc, api_client):
         """
         Test holdings with single position.
 
@@ -316,7 +214,7 @@ class TestHoldingsAPI:
         - Single holding returned correctly
         - Values match database
         """
-        HoldingFactory(
+        Holding.objects.create(
             portfolio=portfolio,
             cryptocurrency=btc,
             quantity=Decimal('0.5'),
@@ -324,9 +222,7 @@ class TestHoldingsAPI:
             total_cost_basis=Decimal('24000.00'),
         )
 
-        client = TestClient(router)
-
-        response = client.get("/holdings")
+        response = api_client.get("/holdings")
 
         assert response.status_code == 200
 
@@ -335,25 +231,10 @@ class TestHoldingsAPI:
         assert len(holdings) == 1
 
         holding = holdings[0]
-        assert Decimal(str(holding["quantity"])) == Decimal('0.5')
+        assert Decimal(holding["quantity"]) == Decimal('0.5')
         assert holding["cryptocurrency"]["symbol"] == "BTC"
 
-    def test_get_holdings_no_user(self):
-        """
-        Test holdings endpoint when no user exists.
-
-        Verifies:
-        - Returns 404 error
-        """
-        User.objects.all().delete()
-
-        client = TestClient(router)
-
-        response = client.get("/holdings")
-
-        assert response.status_code == 404
-
-    def test_get_holdings_gain_loss_calculation(self, portfolio, eth):
+    def test_get_holdings_gain_loss_calculation(self, portfolio, eth, api_client):
         """
         Test gain/loss calculations in holdings response.
 
@@ -366,7 +247,7 @@ class TestHoldingsAPI:
         - Gain/loss calculated correctly
         - Percentage reflects actual gain
         """
-        HoldingFactory(
+        Holding.objects.create(
             portfolio=portfolio,
             cryptocurrency=eth,
             quantity=Decimal('2.0'),
@@ -378,9 +259,7 @@ class TestHoldingsAPI:
         eth.current_price = Decimal('3000.00')
         eth.save()
 
-        client = TestClient(router)
-
-        response = client.get("/holdings")
+        response = api_client.get("/holdings")
 
         assert response.status_code == 200
 
@@ -388,8 +267,33 @@ class TestHoldingsAPI:
 
         expected_gain = Decimal('200.00')  # 2.0 * (3000 - 2900)
 
-        assert Decimal(str(holding["gain_loss"])) == expected_gain
+        assert Decimal(holding["gain_loss"]) == expected_gain
 
         # Current value should be quantity × current_price
         expected_value = Decimal('6000.00')
-        assert Decimal(str(holding["current_value"])) == expected_value
+        assert Decimal(holding["current_value"]) == expected_value
+
+
+@pytest.mark.api
+class TestNoUserAPI:
+    """Test the portfolio endpoints against an empty users table."""
+
+    @pytest.mark.parametrize(
+        "path",
+        ["/portfolio/summary", "/portfolio/history?timeframe=1M", "/holdings"],
+        ids=["summary", "history", "holdings"],
+    )
+    def test_endpoint_without_user(self, no_user, api_client, path):
+        """
+        Test portfolio endpoints when no user exists.
+
+        The trading endpoints' no-user tests live with their other tests in
+        test_api_trading.py.
+
+        Verifies:
+        - Returns 404 with "No user found"
+        """
+        response = api_client.get(path)
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "No user found"
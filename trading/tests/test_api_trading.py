@@ -19,23 +19,43 @@ API Endpoint Behaviors Tested:
 """
 import pytest
 from decimal import Decimal
-from ninja.testing import TestClient
-from trading.api import router
-from trading.models import User, Transaction, Holding
-from trading.tests.factories import (
-    UserFactory,
-    PortfolioFactory,
-    CryptocurrencyFactory,
-    HoldingFactory,
-    TransactionFactory,
-)
+from trading.models import Transaction, Holding
+from trading.tests.factories import TransactionFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def buy_and_sell_txns(portfolio, btc):
+    """One BUY and one SELL of 1 BTC at the current price, inserted in one query."""
+    return Transaction.objects.bulk_create([
+        Transaction(
+            portfolio=portfolio,
+            cryptocurrency=btc,
+            transaction_type=txn_type,
+            quantity=Decimal('1.0'),
+            price_per_unit=btc.current_price,
+            total_amount=btc.current_price,
+            realized_gain_loss=Decimal('0.00'),
+        )
+        for txn_type in (Transaction.TransactionType.BUY, Transaction.TransactionType.SELL)
+    ])
+
+
+@pytest.fixture
+def btc_buy_and_eth_sell(portfolio, btc, eth):
+    """A BUY of BTC and a SELL of ETH, so the transactions list spans two cryptocurrencies."""
+    return [
+        TransactionFactory(portfolio=portfolio, cryptocurrency=btc, transaction_type='BUY'),
+        TransactionFactory(portfolio=portfolio, cryptocurrency=eth, transaction_type='SELL'),
+    ]
 
 
 @pytest.mark.api
 class TestBuyTradeAPI:
     """Test POST /api/trades/buy endpoint."""
 
-    def test_buy_success_with_amount_usd(self, user, portfolio, btc):
+    def test_buy_success_with_amount_usd(self, user, portfolio, btc, api_client):
         """
         Test successful buy trade using USD amount.
 
@@ -50,14 +70,12 @@ class TestBuyTradeAPI:
         - Updated portfolio values returned
         - Cash balance decreased
         """
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(btc.id),
             "amount_usd": "5000.00",
         }
 
-        response = client.post("/trades/buy", json=payload)
+        response = api_client.post("/trades/buy", json=payload)
 
         assert response.status_code == 200
 
@@ -76,9 +94,9 @@ class TestBuyTradeAPI:
 
         # Verify portfolio updated
         updated_portfolio = data["updated_portfolio"]
-        assert Decimal(str(updated_portfolio["cash_balance"])) == Decimal("5000.00")
+        assert Decimal(updated_portfolio["cash_balance"]) == Decimal("5000.00")
 
-    def test_buy_success_with_quantity(self, user, portfolio, eth):
+    def test_buy_success_with_quantity(self, user, portfolio, eth, api_client):
         """
         Test successful buy trade using quantity.
 
@@ -89,14 +107,12 @@ class TestBuyTradeAPI:
         - Quantity parameter accepted
         - Total amount calculated correctly
         """
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(eth.id),
             "quantity": "2.0",
         }
 
-        response = client.post("/trades/buy", json=payload)
+        response = api_client.post("/trades/buy", json=payload)
 
         assert response.status_code == 200
 
@@ -108,7 +124,7 @@ class TestBuyTradeAPI:
         assert Decimal(txn["quantity"]) == Decimal("2.0")
         assert Decimal(txn["total_amount"]) == Decimal("6000.00")  # 2.0 * 3000
 
-    def test_buy_insufficient_funds(self, user, portfolio, btc):
+    def test_buy_insufficient_funds(self, user, portfolio, btc, api_client):
         """
         Test buy fails with insufficient funds.
 
@@ -121,14 +137,12 @@ class TestBuyTradeAPI:
         - Error message indicates insufficient funds
         - No transaction created in database
         """
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(btc.id),
             "amount_usd": "15000.00",
         }
 
-        response = client.post("/trades/buy", json=payload)
+        response = api_client.post("/trades/buy", json=payload)
 
         assert response.status_code == 200  # API returns 200 even for business logic errors
 
@@ -141,7 +155,7 @@ class TestBuyTradeAPI:
         # Verify no transaction created
         assert Transaction.objects.count() == 0
 
-    def test_buy_creates_holding(self, user, portfolio, btc):
+    def test_buy_creates_holding(self, user, portfolio, btc, api_client):
         """
         Test buy creates new holding in database.
 
@@ -150,14 +164,12 @@ class TestBuyTradeAPI:
         - Average purchase price set
         - Cost basis tracked
         """
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(btc.id),
             "amount_usd": "5000.00",
         }
 
-        response = client.post("/trades/buy", json=payload)
+        response = api_client.post("/trades/buy", json=payload)
 
         assert response.status_code == 200
         assert response.json()["success"] is True
@@ -168,28 +180,27 @@ class TestBuyTradeAPI:
             cryptocurrency=btc
         )
 
-        assert holding.quantity == Decimal("5000.00") / btc.current_price
-        assert holding.average_purchase_price == btc.current_price
+        price = btc.current_price
+        assert holding.quantity == Decimal("5000.00") / price
+        assert holding.average_purchase_price == price
 
-    def test_buy_invalid_cryptocurrency_id(self, user, portfolio):
+    def test_buy_invalid_cryptocurrency_id(self, user, portfolio, api_client):
         """
         Test buy with non-existent cryptocurrency.
 
         Verifies:
         - Returns 404 error
         """
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": "00000000-0000-0000-0000-000000000000",
             "amount_usd": "1000.00",
         }
 
-        response = client.post("/trades/buy", json=payload)
+        response = api_client.post("/trades/buy", json=payload)
 
         assert response.status_code == 404
 
-    def test_buy_no_user(self, btc):
+    def test_buy_no_user(self, no_user, btc, api_client):
         """
         Test buy when no user exists.
 
@@ -197,16 +208,12 @@ class TestBuyTradeAPI:
         - Returns error response
         - Error message indicates missing user
         """
-        User.objects.all().delete()
-
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(btc.id),
             "amount_usd": "1000.00",
         }
 
-        response = client.post("/trades/buy", json=payload)
+        response = api_client.post("/trades/buy", json=payload)
 
         assert response.status_code == 200
 
@@ -220,7 +227,7 @@ class TestBuyTradeAPI:
 class TestSellTradeAPI:
     """Test POST /api/trades/sell endpoint."""
 
-    def test_sell_success_full_position(self, user, portfolio, btc):
+    def test_sell_success_full_position(self, user, portfolio, btc, api_client):
         """
         Test successful sell of entire position.
 
@@ -236,7 +243,7 @@ class TestSellTradeAPI:
         - Holding deleted from database
         """
         # Create holding
-        holding = HoldingFactory(
+        holding = Holding.objects.create(
             portfolio=portfolio,
             cryptocurrency=btc,
             quantity=Decimal('0.5'),
@@ -244,14 +251,12 @@ class TestSellTradeAPI:
             total_cost_basis=Decimal('24000.00'),
         )
 
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(btc.id),
             "quantity": "0.5",
         }
 
-        response = client.post("/trades/sell", json=payload)
+        response = api_client.post("/trades/sell", json=payload)
 
         assert response.status_code == 200
 
@@ -267,7 +272,7 @@ class TestSellTradeAPI:
         # Verify holding deleted
         assert not Holding.objects.filter(id=holding.id).exists()
 
-    def test_sell_success_partial_position(self, user, portfolio, eth):
+    def test_sell_success_partial_position(self, user, portfolio, eth, api_client):
         """
         Test successful sell of partial position.
 
@@ -279,21 +284,20 @@ class TestSellTradeAPI:
         - Holding quantity reduced
         - Holding still exists in database
         """
-        HoldingFactory(
+        Holding.objects.create(
             portfolio=portfolio,
             cryptocurrency=eth,
             quantity=Decimal('2.0'),
             average_purchase_price=Decimal('2900.00'),
+            total_cost_basis=Decimal('5800.00'),
         )
 
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(eth.id),
             "quantity": "1.0",
         }
 
-        response = client.post("/trades/sell", json=payload)
+        response = api_client.post("/trades/sell", json=payload)
 
         assert response.status_code == 200
         assert response.json()["success"] is True
@@ -306,7 +310,7 @@ class TestSellTradeAPI:
 
         assert holding.quantity == Decimal('1.0')
 
-    def test_sell_insufficient_holdings(self, user, portfolio, btc):
+    def test_sell_insufficient_holdings(self, user, portfolio, btc, api_client):
         """
         Test sell fails with insufficient holdings.
 
@@ -318,20 +322,20 @@ class TestSellTradeAPI:
         - success=False
         - Error message indicates insufficient holdings
         """
-        HoldingFactory(
+        Holding.objects.create(
             portfolio=portfolio,
             cryptocurrency=btc,
             quantity=Decimal('0.5'),
+            average_purchase_price=Decimal('50000.00'),
+            total_cost_basis=Decimal('25000.00'),
         )
 
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(btc.id),
             "quantity": "1.0",
         }
 
-        response = client.post("/trades/sell", json=payload)
+        response = api_client.post("/trades/sell", json=payload)
 
         assert response.status_code == 200
 
@@ -340,7 +344,7 @@ class TestSellTradeAPI:
         assert data["success"] is False
         assert "Insufficient holdings" in data["error"]
 
-    def test_sell_no_holding_exists(self, user, portfolio, btc):
+    def test_sell_no_holding_exists(self, user, portfolio, btc, api_client):
         """
         Test sell fails when user doesn't own cryptocurrency.
 
@@ -348,14 +352,12 @@ class TestSellTradeAPI:
         - Error indicates no holdings
         - No transaction created
         """
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(btc.id),
             "quantity": "0.5",
         }
 
-        response = client.post("/trades/sell", json=payload)
+        response = api_client.post("/trades/sell", json=payload)
 
         assert response.status_code == 200
 
@@ -364,7 +366,7 @@ class TestSellTradeAPI:
         assert data["success"] is False
         assert "don't own any" in data["error"].lower()
 
-    def test_sell_with_amount_usd(self, user, portfolio, btc):
+    def test_sell_with_amount_usd(self, user, portfolio, btc, api_client):
         """
         Test sell using USD amount instead of quantity.
 
@@ -372,26 +374,28 @@ class TestSellTradeAPI:
         - amount_usd parameter works correctly
         - Quantity calculated from amount
         """
-        HoldingFactory(
+        Holding.objects.create(
             portfolio=portfolio,
             cryptocurrency=btc,
             quantity=Decimal('1.0'),
+            average_purchase_price=Decimal('50000.00'),
+            total_cost_basis=Decimal('50000.00'),
         )
 
-        client = TestClient(router)
-
         payload = {
             "cryptocurrency_id": str(btc.id),
             "amount_usd": "10000.00",
         }
 
-        response = client.post("/trades/sell", json=payload)
+        response = api_client.post("/trades/sell", json=payload)
 
         assert response.status_code == 200
-        assert response.json()["success"] is True
+
+        data = response.json()
+        assert data["success"] is True
 
         # Verify quantity calculated
-        txn = response.json()["transaction"]
+        txn = data["transaction"]
         expected_quantity = Decimal("10000.00") / btc.current_price
         assert Decimal(txn["quantity"]) == expected_quantity
 
@@ -400,7 +404,7 @@ class TestSellTradeAPI:
 class TestTransactionsAPI:
     """Test GET /api/transactions endpoint."""
 
-    def test_get_transactions_empty(self, user, portfolio):
+    def test_get_transactions_empty(self, user, portfolio, api_client):
         """
         Test transactions endpoint with no transactions.
 
@@ -409,9 +413,7 @@ class TestTransactionsAPI:
         - Returns empty array
         - Pagination metadata present
         """
-        client = TestClient(router)
-
-        response = client.get("/transactions")
+        response = api_client.get("/transactions")
 
         assert response.status_code == 200
 
@@ -423,7 +425,8 @@ class TestTransactionsAPI:
 
         assert len(data["items"]) == 0
 
-    def test_get_transactions_with_data(self, user, portfolio, btc, eth):
+    @pytest.mark.max_queries(3)
+    def test_get_transactions_with_data(self, btc_buy_and_eth_sell, api_client):
         """
         Test transactions endpoint with transaction history.
 
@@ -431,22 +434,10 @@ class TestTransactionsAPI:
         - Returns array of transactions
         - Each transaction has required fields
         - Sorted by timestamp (most recent first)
+        - At most 3 queries (user, portfolio, transactions joined to cryptocurrency),
+          whatever the row count: no N+1
         """
-        # Create transactions
-        TransactionFactory(
-            portfolio=portfolio,
-            cryptocurrency=btc,
-            transaction_type='BUY',
-        )
-        TransactionFactory(
-            portfolio=portfolio,
-            cryptocurrency=eth,
-            transaction_type='SELL',
-        )
-
-        client = TestClient(router)
-
-        response = client.get("/transactions")
+        response = api_client.get("/transactions")
 
         assert response.status_code == 200
 
@@ -466,94 +457,31 @@ class TestTransactionsAPI:
             assert "timestamp" in txn
             assert "realized_gain_loss" in txn
 
-    def test_get_transactions_filter_by_type_buy(self, user, portfolio, btc):
+    @pytest.mark.parametrize(
+        "type_filter,expected_types",
+        [
+            ("BUY", ["BUY"]),
+            ("SELL", ["SELL"]),
+            ("ALL", ["BUY", "SELL"]),
+        ],
+    )
+    def test_get_transactions_filter_by_type(self, user, buy_and_sell_txns, api_client, type_filter, expected_types):
         """
-        Test filtering transactions by BUY type.
+        Test the type query param against one BUY and one SELL.
 
         Verifies:
-        - type=BUY query param filters correctly
-        - Only BUY transactions returned
+        - type=BUY / type=SELL return only that type
+        - type=ALL returns both BUY and SELL
         """
-        TransactionFactory(
-            portfolio=portfolio,
-            cryptocurrency=btc,
-            transaction_type='BUY',
-        )
-        TransactionFactory(
-            portfolio=portfolio,
-            cryptocurrency=btc,
-            transaction_type='SELL',
-        )
-
-        client = TestClient(router)
-
-        response = client.get("/transactions?type=BUY")
+        response = api_client.get(f"/transactions?type={type_filter}")
 
         assert response.status_code == 200
 
         transactions = response.json()["items"]
 
-        assert len(transactions) == 1
-        assert transactions[0]["type"] == "BUY"
-
-    def test_get_transactions_filter_by_type_sell(self, user, portfolio, btc):
-        """
-        Test filtering transactions by SELL type.
+        assert sorted(txn["type"] for txn in transactions) == expected_types
 
-        Verifies:
-        - type=SELL query param filters correctly
-        """
-        TransactionFactory(
-            portfolio=portfolio,
-            cryptocurrency=btc,
-            transaction_type='BUY',
-        )
-        TransactionFactory(
-            portfolio=portfolio,
-            cryptocurrency=btc,
-            transaction_type='SELL',
-        )
-
-        client = TestClient(router)
-
-        response = client.get("/transactions?type=SELL")
-
-        assert response.status_code == 200
-
-        transactions = response.json()["items"]
-
-        assert len(transactions) == 1
-        assert transactions[0]["type"] == "SELL"
-
-    def test_get_transactions_filter_all(self, user, portfolio, btc):
-        """
-        Test type=ALL returns all transactions.
-
-        Verifies:
-        - ALL filter shows both BUY and SELL
-        """
-        TransactionFactory(
-            portfolio=portfolio,
-            cryptocurrency=btc,
-            transaction_type='BUY',
-        )
-        TransactionFactory(
-            portfolio=portfolio,
-            cryptocurrency=btc,
-            transaction_type='SELL',
-        )
-
-        client = TestClient(router)
-
-        response = client.get("/transactions?type=ALL")
-
-        assert response.status_code == 200
-
-        transactions = response.json()["items"]
-
-        assert len(transactions) == 2
-
-    def test_get_transactions_pagination(self, user, portfolio, btc):
+    def test_get_transactions_pagination(self, user, portfolio, btc, api_client):
         """
         Test pagination with page_size=20 default.
 
@@ -566,17 +494,11 @@ class TestTransactionsAPI:
         - Pagination works correctly
         - Page parameter accepted
         """
-        # Create 25 transactions
-        for _ in range(25):
-            TransactionFactory(
-                portfolio=portfolio,
-                cryptocurrency=btc,
-            )
-
-        client = TestClient(router)
+        # Create 25 transactions (single multi-row INSERT)
+        TransactionFactory.bulk(25, portfolio=portfolio, cryptocurrency=btc)
 
         # Page 1
-        response = client.get("/transactions?page=1")
+        response = api_client.get("/transactions?page=1")
 
         assert response.status_code == 200
 
@@ -586,7 +508,7 @@ class TestTransactionsAPI:
         assert data["count"] == 25
 
         # Page 2
-        response = client.get("/transactions?page=2")
+        response = api_client.get("/transactions?page=2")
 
         assert response.status_code == 200
 
@@ -594,21 +516,18 @@ class TestTransactionsAPI:
 
         assert len(data["items"]) == 5
 
-    def test_get_transactions_no_user(self):
+    def test_get_transactions_no_user(self, no_user, api_client):
         """
         Test transactions endpoint when no user exists.
 
         Verifies:
         - Returns empty array (graceful handling)
         """
-        User.objects.all().delete()
-
-        client = TestClient(router)
-
-        response = client.get("/transactions")
+        response = api_client.get("/transactions")
 
         assert response.status_code == 200
 
         data = response.json()
 
         assert len(data["items"]) == 0
+        assert data["count"] == 0
@@ -0,0 +1,99 @@
+"""
+Tests for trading management commands.
+
+Key Test Coverage:
+- snapshot_portfolios: End-of-day PortfolioSnapshot rows, idempotent re-runs,
+  rejected backfill dates
+
+Business Rules Tested:
+- Snapshot value = cash_balance + Σ(quantity × current_price), rounded to cents
+- One snapshot per (portfolio, date); re-running for the same day adds nothing
+- Only the day that just closed (yesterday, UTC) can be snapshotted
+"""
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from trading.models import PortfolioSnapshot
+
+pytestmark = pytest.mark.django_db
+
+
+def _yesterday():
+    """The day that just closed (UTC), the only date snapshot_portfolios accepts."""
+    return timezone.now().date() - timedelta(days=1)
+
+
+def _snapshot(snapshot_date):
+    """Run snapshot_portfolios for snapshot_date and return its stdout."""
+    out = StringIO()
+    call_command('snapshot_portfolios', '--date', snapshot_date.isoformat(), stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.unit
+class TestSnapshotPortfoliosCommand:
+    """Test the snapshot_portfolios management command."""
+
+    def test_snapshot_portfolios_creates_snapshot(self, portfolio_with_holdings, btc, eth):
+        """
+        Test a snapshot is written with cash, holdings value and total.
+
+        Scenario:
+        - Portfolio holds 0.5 BTC and 2.0 ETH, cash -$19,800 (fixture)
+
+        Verifies:
+        - One snapshot for the portfolio on the day that just closed
+        - holdings_value = Σ(quantity × current_price)
+        - value = cash + holdings_value
+        """
+        snapshot_date = _yesterday()
+
+        _snapshot(snapshot_date)
+
+        snapshot = PortfolioSnapshot.objects.get(portfolio=portfolio_with_holdings, date=snapshot_date)
+        holdings_value = (
+            Decimal('0.5') * btc.current_price + Decimal('2.0') * eth.current_price
+        ).quantize(Decimal('0.01'))
+        assert snapshot.cash == portfolio_with_holdings.cash_balance
+        assert snapshot.holdings_value == holdings_value
+        assert snapshot.value == portfolio_with_holdings.cash_balance + holdings_value
+
+    def test_snapshot_portfolios_rerun_is_idempotent(self, portfolio_with_holdings):
+        """
+        Test re-running for the same date adds no rows and reports the skip.
+
+        Verifies:
+        - Second run writes no snapshot (still one row for the day)
+        - Stored snapshot is left unchanged
+        - Output reports the portfolio as already snapshotted, not as written
+        """
+        snapshot_date = _yesterday()
+        _snapshot(snapshot_date)
+        first = PortfolioSnapshot.objects.get(portfolio=portfolio_with_holdings, date=snapshot_date)
+
+        output = _snapshot(snapshot_date)
+
+        snapshots = PortfolioSnapshot.objects.filter(portfolio=portfolio_with_holdings, date=snapshot_date)
+        assert snapshots.count() == 1
+        assert snapshots.get().id == first.id
+        assert 'Snapshotted 0 portfolios' in output
+        assert 'already had a snapshot' in output
+
+    def test_snapshot_portfolios_rejects_backfill_date(self, portfolio_with_holdings):
+        """
+        Test a --date other than yesterday is rejected without writing rows.
+
+        Verifies:
+        - CommandError for an older day (current prices are not that day's prices)
+        - No snapshot is stored for it
+        """
+        snapshot_date = date(2025, 1, 15)
+
+        with pytest.raises(CommandError, match='only the day that just closed'):
+            _snapshot(snapshot_date)
+
+        assert not PortfolioSnapshot.objects.filter(date=snapshot_date).exists()
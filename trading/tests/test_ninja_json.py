@@ -0,0 +1,105 @@
+"""
+Tests for the pydantic-core JSON renderer.
+
+trading/ninja_json.py provides TradingJSONRenderer, installed on the API in
+backend/router.py. These tests render the same dumped response data through
+it and through ninja's stock JSONRenderer and compare the results.
+
+Key Test Coverage:
+- Body parity with the stock renderer: Decimals, datetimes, None, nested lists
+- Exact wire format of Decimals and UTC datetimes
+- Datetime precision: microseconds kept (stock truncates to milliseconds)
+- Types unknown to pydantic-core fall back to NinjaJSONEncoder
+"""
+import json
+import pytest
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from django.utils.translation import gettext_lazy
+from ninja.renderers import JSONRenderer
+from trading.ninja_json import TradingJSONRenderer
+
+_TIMESTAMP = datetime(2025, 1, 15, 12, 30, 45, tzinfo=dt_timezone.utc)
+_PRECISE_TIMESTAMP = datetime(2025, 1, 15, 12, 30, 45, 123456, tzinfo=dt_timezone.utc)
+
+# Response data as ninja hands it to the renderer (model_dump() output)
+_POSITIONS = [
+    {
+        'symbol': 'BTC',
+        'quantity': Decimal('0.12345678'),
+        'average_price': Decimal('48000.00'),
+        'opened_at': _TIMESTAMP,
+        'closed_at': None,
+        'history': [
+            {'timestamp': _TIMESTAMP, 'price': Decimal('50000.00')},
+            {'timestamp': _TIMESTAMP, 'price': Decimal('0.00000001')},
+        ],
+    },
+    {
+        'symbol': 'ETH',
+        'quantity': Decimal('2'),
+        'average_price': Decimal('2900.5'),
+        'opened_at': _TIMESTAMP,
+        'closed_at': _TIMESTAMP,
+        'history': [],
+    },
+]
+
+
+def _render(renderer, data):
+    return json.loads(renderer.render(None, data, response_status=200))
+
+
+@pytest.mark.unit
+class TestTradingJSONRenderer:
+    """Compare TradingJSONRenderer with ninja's stock JSONRenderer."""
+
+    def test_output_matches_stock_renderer(self):
+        """
+        Test the renderer produces the same JSON as the stock renderer.
+
+        Verifies:
+        - Decimals serialized as the same strings ("48000.00", "0.00000001")
+        - Datetimes without sub-millisecond parts serialized identically
+        - None fields and nested lists match
+        """
+        assert _render(TradingJSONRenderer(), _POSITIONS) == _render(JSONRenderer(), _POSITIONS)
+
+    def test_decimal_and_datetime_formats(self):
+        """
+        Test the exact wire format of Decimals and datetimes.
+
+        Verifies:
+        - Decimals are strings with their stored exponent
+        - UTC datetimes are ISO-8601 with a Z suffix
+        """
+        body = _render(TradingJSONRenderer(), _POSITIONS)
+
+        assert body[0]['quantity'] == '0.12345678'
+        assert body[0]['average_price'] == '48000.00'
+        assert body[0]['opened_at'] == '2025-01-15T12:30:45Z'
+        assert body[0]['closed_at'] is None
+
+    def test_datetime_keeps_microseconds(self):
+        """
+        Test the documented format change: sub-millisecond datetime precision.
+
+        Verifies:
+        - The renderer writes all six fractional digits
+        - The stock renderer truncates the same value to milliseconds
+        """
+        data = {'timestamp': _PRECISE_TIMESTAMP}
+
+        assert _render(TradingJSONRenderer(), data)['timestamp'] == '2025-01-15T12:30:45.123456Z'
+        assert _render(JSONRenderer(), data)['timestamp'] == '2025-01-15T12:30:45.123Z'
+
+    def test_unknown_types_use_ninja_encoder(self):
+        """
+        Test values pydantic-core cannot encode go through NinjaJSONEncoder.
+
+        Verifies:
+        - A lazy translation string renders as its text, as with the stock renderer
+        """
+        data = {'detail': gettext_lazy('No user found')}
+
+        assert _render(TradingJSONRenderer(), data) == _render(JSONRenderer(), data) == {'detail': 'No user found'}
@@ -18,24 +18,23 @@ Business Rules Tested:
 - Missing prices are non-blocking (contribute $0 to value)
 """
 import pytest
+import numpy as np
 from decimal import Decimal
-from datetime import datetime, timedelta
+from unittest.mock import patch
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.utils import timezone
-from freezegun import freeze_time
-from trading.services.portfolio import PortfolioService
-from trading.tests.factories import (
-    PortfolioFactory,
-    CryptocurrencyFactory,
-    TransactionFactory,
-    PriceHistoryFactory,
-)
+from trading.models import PortfolioSnapshot
+from trading.services.portfolio import PortfolioService, _value_series
+from trading.tests.factories import TransactionFactory
+
+pytestmark = pytest.mark.django_db
 
 
 @pytest.mark.unit
 class TestPortfolioHistoryCalculation:
     """Test PortfolioService.calculate_portfolio_history method."""
 
-    def test_portfolio_history_1d_timeframe(self, portfolio, btc, frozen_time):
+    def test_portfolio_history_1d_timeframe(self, portfolio, btc):
         """
         Test 1D timeframe returns hourly data points.
 
@@ -45,6 +44,8 @@ class TestPortfolioHistoryCalculation:
         - Timestamps are in ascending order
         - Values are non-negative Decimals
         """
+        now = timezone.now()
+
         # Create a transaction to establish inception
         TransactionFactory(
             portfolio=portfolio,
@@ -52,10 +53,10 @@ class TestPortfolioHistoryCalculation:
             transaction_type='BUY',
             quantity=Decimal('0.1'),
             price_per_unit=btc.current_price,
-            timestamp=frozen_time - timedelta(hours=12),
+            timestamp=now - timedelta(hours=12),
         )
 
-        history = PortfolioService.calculate_portfolio_history(portfolio, '1D')
+        history = PortfolioService.calculate_portfolio_history(portfolio, '1D', now=now)
 
         assert len(history) == 24, "1D should return 24 hourly data points"
 
@@ -125,7 +126,6 @@ class TestPortfolioHistoryCalculation:
 
         assert len(history) == 180, "6M should return 180 daily data points"
 
-    @freeze_time('2025-06-15 12:00:00')
     def test_portfolio_history_ytd_timeframe(self, portfolio):
         """
         Test YTD timeframe returns data from Jan 1 to now.
@@ -136,7 +136,8 @@ class TestPortfolioHistoryCalculation:
         - Respects current year boundary
         """
         # June 15 = 165 days from Jan 1 (non-leap year)
-        history = PortfolioService.calculate_portfolio_history(portfolio, 'YTD')
+        now = datetime(2025, 6, 15, 12, tzinfo=dt_timezone.utc)
+        history = PortfolioService.calculate_portfolio_history(portfolio, 'YTD', now=now)
 
         expected_days = (datetime(2025, 6, 15) - datetime(2025, 1, 1)).days
         assert len(history) == expected_days
@@ -158,7 +159,6 @@ class TestPortfolioHistoryCalculation:
         for point in history:
             assert point['portfolio_value'] == portfolio.initial_cash
 
-    @freeze_time('2025-01-15 12:00:00')
     def test_portfolio_history_inception_logic(self, portfolio, btc):
         """
         Test inception calculation: earliest of (first_trade, portfolio.created_at).
@@ -172,9 +172,10 @@ class TestPortfolioHistoryCalculation:
         - Pre-inception points show initial_investment
         - Post-inception points show mark-to-market value
         """
-        # Portfolio created 30 days ago (factory default)
+        # Portfolio created 30 days ago: value the history as of created_at + 30 days
+        now = portfolio.created_at + timedelta(days=30)
         # Create trade 20 days ago
-        trade_time = timezone.now() - timedelta(days=20)
+        trade_time = now - timedelta(days=20)
 
         TransactionFactory(
             portfolio=portfolio,
@@ -190,7 +191,7 @@ class TestPortfolioHistoryCalculation:
         portfolio.cash_balance = portfolio.initial_cash - Decimal('24000.00')
         portfolio.save()
 
-        history = PortfolioService.calculate_portfolio_history(portfolio, '1M')
+        history = PortfolioService.calculate_portfolio_history(portfolio, '1M', now=now)
 
         # Points before portfolio creation should show initial_cash
         inception = portfolio.created_at
@@ -203,7 +204,6 @@ class TestPortfolioHistoryCalculation:
                 # (Exact value depends on price data availability)
                 assert isinstance(point['portfolio_value'], Decimal)
 
-    @freeze_time('2025-01-15 12:00:00')
     def test_portfolio_history_back_dated_trade(self, portfolio, eth):
         """
         Test back-dated trade handling (trade before portfolio creation).
@@ -229,7 +229,8 @@ class TestPortfolioHistoryCalculation:
             timestamp=old_trade_time,
         )
 
-        history = PortfolioService.calculate_portfolio_history(portfolio, '6M')
+        now = portfolio.created_at + timedelta(days=30)
+        history = PortfolioService.calculate_portfolio_history(portfolio, '6M', now=now)
 
         # Should have data points going back to the back-dated trade
         inception = old_trade_time
@@ -284,6 +285,104 @@ class TestPortfolioHistoryCalculation:
             assert point['portfolio_value'] >= 0
             assert isinstance(point['portfolio_value'], Decimal)
 
+    def test_portfolio_history_running_quantity_per_crypto(self, portfolio, btc):
+        """
+        Test holdings follow the running BUY/SELL total computed by the window query.
+
+        Scenario:
+        - BUY 1.0 BTC at day -10, SELL 0.4 at day -5, BUY 0.2 at day -2
+        - CoinGecko BTC price $40,000 for the whole window; cash $10,000
+
+        Verifies:
+        - Quantity held is the running sum of signed trades at each point
+          (0 -> 1.0 -> 0.6 -> 0.8), including points landing exactly on a trade
+        """
+        now = portfolio.created_at + timedelta(days=30)
+        for days_ago, side, quantity in ((10, 'BUY', '1.0'), (5, 'SELL', '0.4'), (2, 'BUY', '0.2')):
+            TransactionFactory(
+                portfolio=portfolio,
+                cryptocurrency=btc,
+                transaction_type=side,
+                quantity=Decimal(quantity),
+                price_per_unit=Decimal('40000.00'),
+                timestamp=now - timedelta(days=days_ago),
+            )
+        with patch('trading.services.portfolio.CoinGeckoService') as coingecko:
+            coingecko.return_value.get_historical_prices.return_value = [
+                {'timestamp': now - timedelta(days=31), 'price': Decimal('40000.00')},
+            ]
+            history = PortfolioService.calculate_portfolio_history(portfolio, '1M', now=now)
+
+        # Daily points: history[k] is at now - (30 - k) days
+        values = [point['portfolio_value'] for point in history]
+        assert values[19] == Decimal('10000.00')   # day -11: nothing held yet
+        assert values[20] == Decimal('50000.00')   # day -10: 1.0 BTC
+        assert values[25] == Decimal('34000.00')   # day -5: 0.6 BTC
+        assert values[28] == Decimal('42000.00')   # day -2: 0.8 BTC
+        assert values[29] == Decimal('42000.00')
+
+    def test_portfolio_history_counts_trades_before_window(self, portfolio, btc):
+        """
+        Test trades before the window start still count toward holdings.
+
+        Scenario:
+        - BUY 1.0 BTC at day -40 (before the 1M window), SELL 0.5 at day -10
+        - CoinGecko BTC price $40,000; cash $10,000
+
+        Verifies:
+        - The first point already holds the pre-window 1.0 BTC
+        - The in-window SELL is applied to that running total (1.0 -> 0.5)
+        """
+        now = portfolio.created_at + timedelta(days=30)
+        for days_ago, side, quantity in ((40, 'BUY', '1.0'), (10, 'SELL', '0.5')):
+            TransactionFactory(
+                portfolio=portfolio,
+                cryptocurrency=btc,
+                transaction_type=side,
+                quantity=Decimal(quantity),
+                price_per_unit=Decimal('40000.00'),
+                timestamp=now - timedelta(days=days_ago),
+            )
+        with patch('trading.services.portfolio.CoinGeckoService') as coingecko:
+            coingecko.return_value.get_historical_prices.return_value = [
+                {'timestamp': now - timedelta(days=31), 'price': Decimal('40000.00')},
+            ]
+            history = PortfolioService.calculate_portfolio_history(portfolio, '1M', now=now)
+
+        values = [point['portfolio_value'] for point in history]
+        assert values[0] == Decimal('50000.00')    # day -30: 1.0 BTC bought before the window
+        assert values[19] == Decimal('50000.00')
+        assert values[20] == Decimal('30000.00')   # day -10: 0.5 BTC
+        assert values[29] == Decimal('30000.00')
+
+    def test_portfolio_history_uses_daily_snapshots(self, portfolio):
+        """
+        Test daily timeframes read past days from PortfolioSnapshot rows.
+
+        Verifies:
+        - A point on a snapshotted day returns the stored EOD value
+        - Days without a snapshot are still valued live
+        """
+        # Portfolio created 30 days before `now`: every point in the window is post-inception
+        now = portfolio.created_at + timedelta(days=30)
+        snapshot_day = (now - timedelta(days=3)).date()
+        PortfolioSnapshot.objects.create(
+            portfolio=portfolio,
+            date=snapshot_day,
+            value=Decimal('12345.67'),
+            cash=Decimal('12345.67'),
+            holdings_value=Decimal('0.00'),
+        )
+
+        history = PortfolioService.calculate_portfolio_history(portfolio, '1M', now=now)
+
+        assert len(history) == 30
+        for point in history:
+            if point['timestamp'].date() == snapshot_day:
+                assert point['portfolio_value'] == Decimal('12345.67')
+            else:
+                assert point['portfolio_value'] == portfolio.initial_cash
+
     def test_portfolio_history_invalid_timeframe_defaults_to_1m(self, portfolio):
         """
         Test invalid timeframe falls back to 1M default.
@@ -331,6 +430,26 @@ class TestPortfolioHistoryCalculation:
 
         assert result == Decimal('0')
 
+    def test_value_series_step_function_and_forward_fill(self):
+        """
+        Test the _value_series valuation kernel on hand-built arrays.
+
+        Verifies:
+        - Quantity is 0 before the first trade and steps at each trade
+        - Prices forward-fill, falling back to the earliest price
+        - Net-short quantities contribute $0
+        """
+        targets = np.array([0.0, 10.0, 20.0, 30.0])
+        positions = [
+            # Buy 2 at t=10, sell 3 at t=30 (net short afterwards); prices from t=15
+            (np.array([10.0, 30.0]), np.array([2.0, -1.0]),
+             np.array([15.0, 25.0]), np.array([100.0, 200.0])),
+        ]
+
+        result = _value_series(targets, positions)
+
+        assert result.tolist() == [0.0, 200.0, 200.0, 0.0]
+
     def test_portfolio_history_multiple_cryptocurrencies(
         self, portfolio, btc, eth, usdc
     ):